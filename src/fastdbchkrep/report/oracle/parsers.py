@@ -2,6 +2,7 @@
 Oracle数据库解析器类 - 从markdown_generator.py迁移而来
 包含所有用于解析Oracle数据库巡检文件的Parser类
 """
+import functools
 import re
 import json
 from pathlib import Path
@@ -2619,6 +2620,44 @@ class PlsqlVirusParser:
         return result
 
 
+@functools.lru_cache(maxsize=64)
+def _parse_inspection_summary_cached(path_str: str, mtime_ns: int, size: int) -> tuple:
+    """按 (路径, mtime, size) 缓存摘要字段；返回不可变元组，异常不缓存。"""
+    with open(path_str, 'r', encoding='utf-8', errors='ignore') as f:
+        content = f.read()
+
+    # 提取主机名
+    hostname_match = re.search(r'主机名:\s*(\S+)', content)
+    hostname = hostname_match.group(1) if hostname_match else "unknown"
+
+    # 提取SID
+    sid_match = re.search(r'SID:\s*(\S+)', content)
+    sid = sid_match.group(1) if sid_match else "unknown"
+
+    # 提取数据库模式
+    db_model_match = re.search(r'数据库模式:\s*(\S+)', content)
+    db_model = db_model_match.group(1) if db_model_match else "unknown"
+
+    # 提取巡检时间
+    time_match = re.search(r'巡检时间:\s*(.+)', content)
+    inspection_time = time_match.group(1).strip() if time_match else "未知时间"
+
+    # 提取文件状态部分（从"文件生成状态报告"到"状态说明"）
+    status_section_match = re.search(
+        r'文件生成状态报告:\s*\n=+\s*\n(.*?)\n状态说明:',
+        content,
+        re.DOTALL
+    )
+
+    if status_section_match:
+        file_status_content = status_section_match.group(1).strip()
+    else:
+        # 如果没有找到标准格式，尝试提取整个文件状态区域
+        file_status_content = "文件状态信息提取失败"
+
+    return hostname, sid, db_model, inspection_time, file_status_content
+
+
 class InspectionSummaryParser:
     """00_inspection_summary.txt文件解析器"""
 
@@ -2627,6 +2666,9 @@ class InspectionSummaryParser:
         """
         解析00_inspection_summary.txt文件
 
+        按 (路径, mtime, size) 缓存解析结果：单节点生成与RAC合并在同一进程内会重复解析同一文件，
+        文件被改写后缓存键随之变化；解析失败不缓存，每次调用返回新的数据对象。
+
         Args:
             file_path: 文件路径
 
@@ -2634,45 +2676,9 @@ class InspectionSummaryParser:
             InspectionSummaryData: 解析后的数据，解析失败返回None
         """
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-
-            # 提取主机名
-            hostname_match = re.search(r'主机名:\s*(\S+)', content)
-            hostname = hostname_match.group(1) if hostname_match else "unknown"
-
-            # 提取SID
-            sid_match = re.search(r'SID:\s*(\S+)', content)
-            sid = sid_match.group(1) if sid_match else "unknown"
-
-            # 提取数据库模式
-            db_model_match = re.search(r'数据库模式:\s*(\S+)', content)
-            db_model = db_model_match.group(1) if db_model_match else "unknown"
-
-            # 提取巡检时间
-            time_match = re.search(r'巡检时间:\s*(.+)', content)
-            inspection_time = time_match.group(1).strip() if time_match else "未知时间"
-
-            # 提取文件状态部分（从"文件生成状态报告"到"状态说明"）
-            status_section_match = re.search(
-                r'文件生成状态报告:\s*\n=+\s*\n(.*?)\n状态说明:',
-                content,
-                re.DOTALL
-            )
-
-            if status_section_match:
-                file_status_content = status_section_match.group(1).strip()
-            else:
-                # 如果没有找到标准格式，尝试提取整个文件状态区域
-                file_status_content = "文件状态信息提取失败"
-
-            return InspectionSummaryData(
-                hostname=hostname,
-                sid=sid,
-                db_model=db_model,
-                inspection_time=inspection_time,
-                file_status_content=file_status_content
-            )
+            st = Path(file_path).stat()
+            fields = _parse_inspection_summary_cached(str(file_path), st.st_mtime_ns, st.st_size)
+            return InspectionSummaryData(*fields)
 
         except Exception as e:
             logger.error(f"解析00_inspection_summary.txt失败: {e}")
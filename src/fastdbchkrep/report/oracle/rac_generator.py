@@ -10,10 +10,15 @@ RAC 报告合并器
 """
 from __future__ import annotations
 
+import bisect
+import functools
+import os
 import re
 import shutil
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Set
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Set
 from loguru import logger
 
 from .rac_parsers import load_rac_meta
@@ -24,6 +29,101 @@ from .parsers import InspectionSummaryParser
 from datetime import datetime
 
 
+# ===============
+# 预编译正则
+# ===============
+
+# 6.x 小节 AWR 图片路径：Markdown (./awr_picture/ 与 HTML src="./awr_picture/ / src='./awr_picture/，
+# 兼容省略 ./ 的写法，单遍替换
+_RE_AWR_REF = re.compile(r"(\(|src=[\"'])(?:\./?)?awr_picture/")
+
+# 代码块结束后追加分割线；折叠相邻/被空行分隔的重复分割线
+_RE_HR_PATTERN = re.compile(r"(^```[^\n]*\n[\s\S]*?\n```[ \t]*\n?)(?!\n?---)", re.MULTILINE)
+_RE_HR_RUN = re.compile(r"(?m)^(?:\s*\n)*---\s*\n(?:(?:\s*\n)*---\s*\n)+")
+
+# 单节点 MD 章节标题
+_RE_SEC_4_4 = re.compile(r"(?m)^##\s*4\.4\.?\s*.*磁盘空间使用率\s*$")
+_RE_SEC_5_1 = re.compile(r"(?m)^##\s*5\.1\.?\s*RMAN\s*备份信息\s*$")
+_RE_SEC_5_2 = re.compile(r"(?m)^##\s*5\.2\.?\s*数据库\s*Data\s*Guard\s*容灾\s*$")
+_RE_SEC_5_3 = re.compile(r"(?m)^##\s*5\.3\.?\s*ADRCI、ALERT\s*日志检查\s*$")
+# 通用小节提取：小节编号 -> 标题正则（按顺序尝试，首个命中者生效）
+_SECTION_PATTERNS: Dict[str, Tuple[re.Pattern, ...]] = {
+    "5.4": (re.compile(r"(?m)^##\s*5\.4\.?\s*控制文件和在线日志文件\s*$"),),
+    "5.5": (re.compile(r"(?m)^##\s*5\.5\.?\s*表空间数据文件、归档文件明细\s*$"),),
+    # 兼容“ASM 磁盘信息”与“ASM磁盘详细信息”
+    "5.6": (
+        re.compile(r"(?m)^##\s*5\.6\.?\s*ASM\s*磁盘信息\s*$"),
+        re.compile(r"(?m)^##\s*5\.6\.?\s*ASM\s*磁盘详细信息\s*$"),
+    ),
+    "5.7": (re.compile(r"(?m)^##\s*5\.7\.?\s*PL/SQLDeveloper破解版勒索病毒检查\s*$"),),
+    "6.1": (re.compile(r"(?m)^##\s*6\.1\.?\s*数据库实例命中率\s*$"),),
+    "6.2": (re.compile(r"(?m)^##\s*6\.2\.?\s*数据库资源消耗时间模型\s*$"),),
+    "6.3": (re.compile(r"(?m)^##\s*6\.3\.?\s*数据库等待事件\s*$"),),
+    "6.4": (re.compile(r"(?m)^##\s*6\.4\.?\s*TOP\s*SQL\s*$"),),
+}
+# 章节截止：下一个二级标题（## N.）/ 任意级别标题（#~###### N.）
+_RE_NEXT_HEADER = re.compile(r"(?m)^##\s+\d+\.")
+_RE_NEXT_SECTION = re.compile(r"(?m)^#{1,6}\s+\d+\.\s*")
+_RE_CONCLUSION = re.compile(r"(?m)^\s*综合结论：.*$")
+
+# 5.1 RMAN 三段小标题
+_RE_RMAN_POLICY = re.compile(r"(?m)^\*\*.*?Oracle\s*数据库\s*RMAN\s*备份策略如下：\*\*$")
+_RE_RMAN_PATH = re.compile(r"(?m)^\*\*.*?Oracle\s*数据库\s*RMAN\s*备份集路径如下：\*\*$")
+_RE_RMAN_DETAIL = re.compile(r"(?m)^\*\*.*?Oracle\s*数据库\s*RMAN\s*备份集合明细如下：\*\*$")
+# 5.3 ADRCI/ALERT 小标题（ALERT 有带冒号与不带冒号两种形式）
+_RE_ADRCI_TITLE = re.compile(r"(?m)^\*\*\s*.*?ADRCI\s*诊断工具日志检查：\s*\*\*\s*$")
+_RE_ALERT_TITLE_COLON = re.compile(r"(?m)^\*\*\s*.*?ALERT日志检查\s*\*\*：\s*$")
+_RE_ALERT_TITLE = re.compile(r"(?m)^\*\*\s*.*?ALERT日志检查\s*\*\*\s*$")
+
+# Markdown 表格分隔线 |---|；连续的表格行块（允许行首空白）
+_RE_TABLE_SEP = re.compile(r"\|\s*-+\s*\|")
+_RE_MD_TABLE_BLOCK = re.compile(r"(?m)(?:^[^\S\n]*\|[^\n]*(?:\n|\Z))+")
+
+# 支持工程师/现场支持总时间 表格行
+_RE_SUPNAME = re.compile(r"\|\s*支持工程师\s*\|\s*([^|\n]+?)\s*\|")
+_RE_SUPTIME = re.compile(r"\|\s*现场支持总时间（小时）\s*\|\s*([^|\n]+?)\s*\|")
+
+# 04_health_check.txt：C1 日志路径（允许 AUDIT_FIL_DEST 拼写变体）、C2 控制文件、8. 日志文件信息
+_RE_LOG_LINE = re.compile(
+    r"^\s*(\d+)\s+(ALERT_LOG|AUDIT_FILE_DEST|AUDIT_FIL_DEST|CORE_DUMP_DEST|DIAGNOSTIC_DEST|USER_DUMP_DEST)\s+(.+?)\s*$",
+    re.MULTILINE,
+)
+_RE_C2_TITLE = re.compile(r"(?im)^\s*C2\.\s*.*?控制文件路径\s*$")
+_RE_HC_NEXT_TITLE = re.compile(r"(?im)^\s*(?:C\d+\.|\d+\.)\s*")
+_RE_CONTROLFILE_LOOSE = re.compile(r"([+/]\S*controlfile\S*)", re.IGNORECASE)
+_RE_LOGFILE_TITLE = re.compile(r"\b8\.\s*日志文件信息")
+_RE_SEP = re.compile(r"^[\-\s]+$")
+_RE_HC_SUBTITLE = re.compile(r"^[A-Z]?\d+\.")
+
+# 08_crs_info.txt 小节标题与全等号分隔线
+_RE_CRS_HEAD = re.compile(r"^\s*==\s*CRS资源状态")
+_RE_VOTE_HEAD = re.compile(r"^\s*==\s*Voting\s+Disk\s+Information\s*==")
+_RE_OCR_HEAD = re.compile(r"^\s*==\s*OCR检查")
+_RE_SEP_LINE = re.compile(r"^\s*=+\s*$")
+
+
+# 写出 rac.md 时每次编码/写入的字符数
+_WRITE_CHUNK_CHARS = 1 << 18
+
+# 转换器实例按线程复用：实例在转换过程中保存 md_content 等中间状态，不能跨线程共享
+_CONVERTER_LOCAL = threading.local()
+
+
+def _get_converter() -> MarkdownToPdfConverter:
+    """获取当前线程复用的 MarkdownToPdfConverter 实例（首次调用时创建）。"""
+    conv = getattr(_CONVERTER_LOCAL, 'conv', None)
+    if conv is None:
+        conv = MarkdownToPdfConverter()
+        _CONVERTER_LOCAL.conv = conv
+    return conv
+
+
+@functools.lru_cache(maxsize=64)
+def _named_table_re(title_zh: str) -> re.Pattern:
+    """加粗表格标题正则，允许粗体内包含中文或英文冒号：**数据库基本信息：** 或 **数据库基本信息**。"""
+    return re.compile(rf"\*\*\s*{re.escape(title_zh)}\s*[：:]?\s*\*\*")
+
+
 class RacReportMerger:
     """RAC 输出合并工具"""
 
@@ -354,17 +454,57 @@ def _build_problems_table() -> str:
     )
 
 
+# 文件状态表行模板（绑定 str.format，循环内单次 C 调用完成拼接）
+_ROW3 = "| {} | {} | {} |".format
+_ROW5 = "| {} | {} | {} | {} | {} |".format
+
+
 def _format_file_status_content(file_status_content: str) -> str:
     """将文件状态内容格式化为表格，复用单节点逻辑。"""
     lines = (file_status_content or "").split('\n')
-    table = "| 状态 | 文件名 | 文件描述 |\n|---|---|---|\n"
+    rows: List[str] = ["| 状态 | 文件名 | 文件描述 |\n|---|---|---|\n"]
     for line in lines:
         s = line.strip()
         if s and any(symbol in s for symbol in ['[✓]', '[✗]', '[○]', '[?]']):
             m = re.match(r"\[(.)\]\s+(\S+)\s+(.+)", s)
             if m:
-                table += f"| {m.group(1)} | {m.group(2)} | {m.group(3)} |\n"
-    return table
+                rows.append(_ROW3(*m.groups()) + "\n")
+    return "".join(rows)
+
+
+_CN_WEEKDAYS = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
+
+# 巡检时间的数字格式与英文 date/日志风格格式（按优先级排列）
+_ISO_TIME_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%Y%m%d",
+)
+_EN_TIME_FORMATS = (
+    "%a %b %d %H:%M:%S %Z %Y",   # Fri Sep  5 18:12:42 CST 2025
+    "%a, %b %d %H:%M:%S %Z %Y",
+    "%a %b %d %H:%M:%S %Y",
+    "%a, %d %b %Y %H:%M:%S %Z",
+    "%a, %d %b %Y %H:%M:%S %z",
+    "%a, %d %b %Y %H:%M:%S",
+    "%d %b %Y %H:%M:%S %Z",
+    "%b %d %Y %H:%M:%S",
+)
+
+_TIME_FORMATS = _ISO_TIME_FORMATS + _EN_TIME_FORMATS
+
+
+def _match_time_date(text: str) -> Optional[datetime]:
+    """按时间格式依次尝试解析文本；无匹配返回 None。"""
+    for fmt in _TIME_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
 
 
 def _format_inspection_time_cn(raw_time: Optional[str]) -> str:
@@ -385,48 +525,15 @@ def _format_inspection_time_cn(raw_time: Optional[str]) -> str:
             month = int(m.group(2))
             day = int(m.group(3))
             try:
-                weekday_idx = datetime(year, month, day).weekday()
-                weekday_cn = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"][weekday_idx]
+                weekday_cn = _CN_WEEKDAYS[datetime(year, month, day).weekday()]
             except Exception:
                 weekday_cn = m.group(4) or ""
             return f"{year}年{month:02d}月{day:02d}日{weekday_cn}"
 
-        # 2) ISO/常见数字格式
-        patterns = [
-            "%Y-%m-%dT%H:%M:%S%z",
-            "%Y-%m-%d %H:%M:%S%z",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%d",
-            "%Y/%m/%d",
-            "%Y%m%d",
-        ]
-
-        for p in patterns:
-            try:
-                dt = datetime.strptime(text, p)
-                weekday_cn = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"][dt.weekday()]
-                return f"{dt.year}年{dt.month:02d}月{dt.day:02d}日{weekday_cn}"
-            except Exception:
-                pass
-
-        # 3) 英文 date/日志风格（尽量兼容）
-        en_patterns = [
-            "%a %b %d %H:%M:%S %Z %Y",   # Fri Sep  5 18:12:42 CST 2025
-            "%a, %b %d %H:%M:%S %Z %Y",
-            "%a %b %d %H:%M:%S %Y",
-            "%a, %d %b %Y %H:%M:%S %Z",
-            "%a, %d %b %Y %H:%M:%S %z",
-            "%a, %d %b %Y %H:%M:%S",
-            "%d %b %Y %H:%M:%S %Z",
-            "%b %d %Y %H:%M:%S",
-        ]
-        for p in en_patterns:
-            try:
-                dt = datetime.strptime(text, p)
-                weekday_cn = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"][dt.weekday()]
-                return f"{dt.year}年{dt.month:02d}月{dt.day:02d}日{weekday_cn}"
-            except Exception:
-                pass
+        # 2) ISO/常见数字格式；3) 英文 date/日志风格（尽量兼容）
+        dt = _match_time_date(text)
+        if dt:
+            return f"{dt.year}年{dt.month:02d}月{dt.day:02d}日{_CN_WEEKDAYS[dt.weekday()]}"
 
         # 4) 英文行手动提取年月日（回退方案）
         mon_map = {
@@ -439,8 +546,7 @@ def _format_inspection_time_cn(raw_time: Optional[str]) -> str:
             month = mon_map[m2.group(1)]
             day = int(m2.group(2))
             try:
-                dt = datetime(year, month, day)
-                weekday_cn = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"][dt.weekday()]
+                weekday_cn = _CN_WEEKDAYS[datetime(year, month, day).weekday()]
             except Exception:
                 weekday_cn = ""
             return f"{year}年{month:02d}月{day:02d}日{weekday_cn}"
@@ -506,7 +612,7 @@ def _build_dual_node_file_status_table(
         c2 = e2['status'] if e2 else ''
         f2 = e2['filename'] if e2 else ''
         desc = (e1['desc'] if e1 else (e2['desc'] if e2 else ''))
-        rows.append(f"| {c1} | {f1} | {c2} | {f2} | {desc} |")
+        rows.append(_ROW5(c1, f1, c2, f2, desc))
     return header + "\n".join(rows)
 
 
@@ -610,25 +716,33 @@ def create_rac_md(
         if idx in node_by_number:
             ordered_nodes.append(node_by_number[idx])
     if len(ordered_nodes) < 2:
-        # 回退取前两个
+        # 回退取前两个（按对象身份去重，避免逐个比较节点字典）
+        used_ids: Set[int] = {id(n) for n in ordered_nodes}
         for n in metainfo:
-            if n not in ordered_nodes:
+            if id(n) not in used_ids:
+                used_ids.add(id(n))
                 ordered_nodes.append(n)
             if len(ordered_nodes) >= 2:
                 break
 
+    # 两节点的 hostname/sid 只取一次，后续各章节直接复用
+    n1: Optional[Dict[str, Any]] = ordered_nodes[0] if ordered_nodes else None
+    n2: Optional[Dict[str, Any]] = ordered_nodes[1] if len(ordered_nodes) > 1 else None
+    host1, sid1 = (n1.get('hostname', ''), n1.get('sid', '')) if n1 else ('', '')
+    host2, sid2 = (n2.get('hostname', ''), n2.get('sid', '')) if n2 else ('', '')
+
     # 解析两个节点的 summary 数据
     for i, node in enumerate(ordered_nodes[:2], start=1):
         try:
-            files = node.get('files') or {}
-            summary = files.get('00_inspection_summary')
-            if summary and isinstance(summary, dict) and summary.get('path'):
-                summ = InspectionSummaryParser.parse_inspection_summary(Path(summary['path']))
+            summary = (node.get('files') or {}).get('00_inspection_summary')
+            summary_path = summary.get('path') if isinstance(summary, dict) else None
+            if summary_path:
+                summ = InspectionSummaryParser.parse_inspection_summary(Path(summary_path))
                 if summ:
                     if inspection_time_raw is None:
                         inspection_time_raw = summ.inspection_time
                     entries = _parse_file_status_entries(summ.file_status_content)
-                    sid_val = node.get('sid') or (summ.sid if hasattr(summ, 'sid') else None)
+                    sid_val = node.get('sid') or getattr(summ, 'sid', None)
                     if i == 1:
                         node1_sid = sid_val
                         node1_entries = entries
@@ -726,11 +840,9 @@ def create_rac_md(
     hw_table = ""
     try:
         if node1_sid and node2_sid:
-            md1 = _find_node_md_by_sid(target_dir, node1_sid)
-            md2 = _find_node_md_by_sid(target_dir, node2_sid)
+            md1 = _find_node_md_by_sid(target_dir, node1_sid, host1)
+            md2 = _find_node_md_by_sid(target_dir, node2_sid, host2)
             if md1 and md2:
-                host1 = ordered_nodes[0].get('hostname', '') if ordered_nodes else ''
-                host2 = ordered_nodes[1].get('hostname', '') if len(ordered_nodes) > 1 else ''
                 hw_table = _build_dual_node_system_hardware_table(md1, md2, node1_sid, node2_sid, hostname1=host1, hostname2=host2)
             else:
                 if not quiet:
@@ -746,37 +858,30 @@ def create_rac_md(
     db_config_block = ""
     try:
         if node1_sid and node2_sid:
-            md1 = _find_node_md_by_sid(target_dir, node1_sid)
-            md2 = _find_node_md_by_sid(target_dir, node2_sid)
+            md1 = _find_node_md_by_sid(target_dir, node1_sid, host1)
+            md2 = _find_node_md_by_sid(target_dir, node2_sid, host2)
             if md1 and md2:
                 db_basic_1 = _parse_named_table_from_md(md1, "数据库基本信息")
                 db_basic_2 = _parse_named_table_from_md(md2, "数据库基本信息")
 
                 # 在渲染前，从 04_health_check.txt 注入派生值（控制文件数量/在线日志大小一致性）
+                # 日志配置也一并解析，整个文件只读取一次
                 hc_path = _find_health_check_path(ordered_nodes[:2])
+                hc_logs = None
                 if hc_path and hc_path.exists():
-                    try:
-                        ctrl_count = _parse_control_file_count(hc_path)
-                        if ctrl_count is not None:
-                            db_basic_1['CONTROL_FILE_COUNT'] = (str(ctrl_count), '控制文件数量')
-                    except Exception as e:
-                        logger.warning(f"解析控制文件数量失败: {e}")
-                    try:
-                        same_size_flag = _parse_online_logs_same_size(hc_path)
-                        if same_size_flag:
-                            db_basic_1['ONLINE_LOGS_SAME_SIZE'] = (same_size_flag, '在线日志文件大小一致性')
-                    except Exception as e:
-                        logger.warning(f"解析在线日志大小一致性失败: {e}")
+                    hc_logs, ctrl_count, same_size_flag = _parse_health_check_all(hc_path, node1_sid, node2_sid)
+                    if ctrl_count is not None:
+                        db_basic_1.set('CONTROL_FILE_COUNT', str(ctrl_count), '控制文件数量')
+                    if same_size_flag:
+                        db_basic_1.set('ONLINE_LOGS_SAME_SIZE', same_size_flag, '在线日志文件大小一致性')
 
                 # 基本信息（多行值合并：CURRENT_SESSION/DB_SID/HOST_NAME/STARTUP_TIME/LOG_MODE/ARCHIVE_MODE）
                 # 从节点信息中获取hostname，覆盖HOST_NAME显示
-                node1_hostname = ordered_nodes[0].get('hostname', '') if ordered_nodes else ''
-                node2_hostname = ordered_nodes[1].get('hostname', '') if len(ordered_nodes) > 1 else ''
                 db_basic_rows = _build_db_basic_info_combined_table(
                     node1_sid, db_basic_1,
                     node2_sid, db_basic_2,
-                    hostname1=node1_hostname,
-                    hostname2=node2_hostname,
+                    hostname1=host1,
+                    hostname2=host2,
                 )
 
                 # 数据库使用空间（与基本信息相同呈现逻辑）
@@ -798,11 +903,9 @@ def create_rac_md(
                 )
 
                 # 日志配置（优先从 04_health_check.txt 的 C1. 重要日志文件路径 提取）
-                log_1 = {}
-                log_2 = {}
-                # hc_path 已在前面求得
-                if hc_path and hc_path.exists():
-                    log_1, log_2 = _parse_log_config_from_health_check(hc_path, node1_sid, node2_sid)
+                # hc_logs 已在前面随 04_health_check.txt 一并解析
+                if hc_logs is not None:
+                    log_1, log_2 = hc_logs
                 else:
                     # 回退：从各自MD的“日志配置”表获取
                     log_1 = _parse_named_table_from_md(md1, "日志配置")
@@ -842,13 +945,11 @@ def create_rac_md(
     section_4_block = ""
     try:
         if node1_sid and node2_sid:
-            n1 = ordered_nodes[0]
-            n2 = ordered_nodes[1] if len(ordered_nodes) > 1 else None
             if n2:
                 section_4_block = _build_section_4_content(
                     target_dir=target_dir,
-                    hostname1=n1.get('hostname', ''), sid1=n1.get('sid', ''),
-                    hostname2=n2.get('hostname', ''), sid2=n2.get('sid', ''),
+                    hostname1=host1, sid1=sid1,
+                    hostname2=host2, sid2=sid2,
                 )
     except Exception as e:
         logger.warning(f"生成第4章操作系统检查失败: {e}")
@@ -857,14 +958,12 @@ def create_rac_md(
     section_5_block = ""
     try:
         if node1_sid and node2_sid:
-            n1 = ordered_nodes[0]
-            n2 = ordered_nodes[1] if len(ordered_nodes) > 1 else None
             if n2:
-                md1 = _find_node_md_by_sid(target_dir, n1.get('sid', ''))
-                md2 = _find_node_md_by_sid(target_dir, n2.get('sid', ''))
+                md1 = _find_node_md_by_sid(target_dir, sid1, host1)
+                md2 = _find_node_md_by_sid(target_dir, sid2, host2)
                 # 5.1 RMAN
-                body1 = _extract_rman_5_1_body_from_md(md1, n1.get('hostname',''), n1.get('sid','')) if md1 else None
-                body2 = _extract_rman_5_1_body_from_md(md2, n2.get('hostname',''), n2.get('sid','')) if md2 else None
+                body1 = _extract_rman_5_1_body_from_md(md1, host1, sid1) if md1 else None
+                body2 = _extract_rman_5_1_body_from_md(md2, host2, sid2) if md2 else None
                 parts: List[str] = ["## 5.1.RMAN 备份信息\n\n"]
                 any_51 = False
                 if body1:
@@ -886,8 +985,8 @@ def create_rac_md(
                     parts.append("---\n\n")
 
                 # 5.3 ADRCI、ALERT 日志检查：两节点内容都装载
-                sec53_1 = _extract_5_3_body_from_md(md1, n1.get('hostname',''), n1.get('sid','')) if md1 else None
-                sec53_2 = _extract_5_3_body_from_md(md2, n2.get('hostname',''), n2.get('sid','')) if md2 else None
+                sec53_1 = _extract_5_3_body_from_md(md1, host1, sid1) if md1 else None
+                sec53_2 = _extract_5_3_body_from_md(md2, host2, sid2) if md2 else None
                 if sec53_1 or sec53_2:
                     parts.append("## 5.3. ADRCI、ALERT 日志检查\n\n")
                     if sec53_1:
@@ -942,14 +1041,14 @@ def create_rac_md(
                 if any([mp1, mp2, udev1, udev2]):
                     parts.append("## 5.8. 磁盘多路径、ASM_UDEV 配置\n\n")
                     # multipath
-                    parts.append(f"### 【{n1.get('hostname','')}】  磁盘多路径文件\n\n")
+                    parts.append(f"### 【{host1}】  磁盘多路径文件\n\n")
                     parts.append("```\n" + (mp1 or "未找到多路径信息") + "\n```\n\n")
-                    parts.append(f"### 【{n2.get('hostname','')}】  磁盘多路径文件\n\n")
+                    parts.append(f"### 【{host2}】  磁盘多路径文件\n\n")
                     parts.append("```\n" + (mp2 or "未找到多路径信息") + "\n```\n\n")
                     # asm udev
-                    parts.append(f"### 【{n1.get('hostname','')}】  ASM_UDEV 配置\n\n")
+                    parts.append(f"### 【{host1}】  ASM_UDEV 配置\n\n")
                     parts.append("```\n" + (udev1 or "未找到ASM UDEV配置") + "\n```\n\n")
-                    parts.append(f"### 【{n2.get('hostname','')}】ASM_UDEV 配置\n\n")
+                    parts.append(f"### 【{host2}】ASM_UDEV 配置\n\n")
                     parts.append("```\n" + (udev2 or "未找到ASM UDEV配置") + "\n```\n\n")
                     parts.append("综合结论：【请填写结论】\n\n")
                     parts.append("---\n\n")
@@ -978,38 +1077,35 @@ def create_rac_md(
     # 写入文件：<identifier>.rac.md
     rac_md_name = f"{identifier}.rac.md"
     rac_md_path = target_dir / rac_md_name
-    content = cover_page + toc_page + document_control + section_1_and_2 + section_2_3
+    # 各章节先收集为片段列表，最后一次性拼接，避免逐段 += 反复复制整份报告
+    content_parts: List[str] = [cover_page, toc_page, document_control, section_1_and_2, section_2_3]
     # 章节分割线
-    content += "\n---\n\n"
+    content_parts.append("\n---\n\n")
     if hw_table or db_config_block:
-        content += section_3
+        content_parts.append(section_3)
         if hw_table:
-            content += section_3_1_header + hw_table + "\n"
+            content_parts.extend((section_3_1_header, hw_table, "\n"))
         # 二级分割线：3.1 与 3.2 之间
         if hw_table and db_config_block:
-            content += "---\n\n"
+            content_parts.append("---\n\n")
         if db_config_block:
-            content += section_3_2_header + db_config_block
+            content_parts.extend((section_3_2_header, db_config_block))
         # 章节分割线
-        content += "\n---\n\n"
+        content_parts.append("\n---\n\n")
     if section_4_block:
-        content += "\n# 4. 操作系统检查\n\n" + section_4_block
-        content += "\n---\n\n"
+        content_parts.extend(("\n# 4. 操作系统检查\n\n", section_4_block, "\n---\n\n"))
     if section_5_block:
-        content += "\n# 5. 数据库配置检查\n\n" + section_5_block
-        content += "\n---\n\n"
+        content_parts.extend(("\n# 5. 数据库配置检查\n\n", section_5_block, "\n---\n\n"))
     # 6. 数据库性能检查（前置引言+两节点AWR基础信息；随后装载 6.1~6.4 并加分割线；6.5 统一结论）
     try:
         if node1_sid and node2_sid:
-            n1 = ordered_nodes[0]
-            n2 = ordered_nodes[1] if len(ordered_nodes) > 1 else None
             if n2:
-                md1 = _find_node_md_by_sid(target_dir, n1.get('sid', ''))
-                md2 = _find_node_md_by_sid(target_dir, n2.get('sid', ''))
+                md1 = _find_node_md_by_sid(target_dir, sid1, host1)
+                md2 = _find_node_md_by_sid(target_dir, sid2, host2)
                 # 6. 引言与基础AWR三图
                 prelude = _build_ch6_prelude(
-                    hostname1=n1.get('hostname',''), sid1=n1.get('sid',''),
-                    hostname2=n2.get('hostname',''), sid2=n2.get('sid',''),
+                    hostname1=host1, sid1=sid1,
+                    hostname2=host2, sid2=sid2,
                     customer_unit=customer_unit, customer_system=customer_system,
                     db_model_display=db_model_display,
                 )
@@ -1028,59 +1124,63 @@ def create_rac_md(
                     if sec61_1 or sec61_2:
                         parts6.append("## 6.1. 数据库实例命中率\n\n")
                         if sec61_1:
-                            parts6.append(f"### {n1.get('hostname','')} ({n1.get('sid','')})\n\n")
-                            parts6.append(_rewrite_awrpicture_links_for_node(sec61_1.strip(), n1.get('hostname',''), n1.get('sid','')) + "\n\n")
+                            parts6.append(f"### {host1} ({sid1})\n\n")
+                            parts6.append(_rewrite_awrpicture_links_for_node(sec61_1.strip(), host1, sid1) + "\n\n")
                         if sec61_2:
-                            parts6.append(f"### {n2.get('hostname','')} ({n2.get('sid','')})\n\n")
-                            parts6.append(_rewrite_awrpicture_links_for_node(sec61_2.strip(), n2.get('hostname',''), n2.get('sid','')) + "\n\n")
+                            parts6.append(f"### {host2} ({sid2})\n\n")
+                            parts6.append(_rewrite_awrpicture_links_for_node(sec61_2.strip(), host2, sid2) + "\n\n")
                         parts6.append("综合结论：【请填写结论】\n\n")
                         parts6.append("---\n\n")
                     if sec62_1 or sec62_2:
                         parts6.append("## 6.2. 数据库资源消耗时间模型\n\n")
                         if sec62_1:
-                            parts6.append(f"### {n1.get('hostname','')} ({n1.get('sid','')})\n\n")
-                            parts6.append(_rewrite_awrpicture_links_for_node(sec62_1.strip(), n1.get('hostname',''), n1.get('sid','')) + "\n\n")
+                            parts6.append(f"### {host1} ({sid1})\n\n")
+                            parts6.append(_rewrite_awrpicture_links_for_node(sec62_1.strip(), host1, sid1) + "\n\n")
                         if sec62_2:
-                            parts6.append(f"### {n2.get('hostname','')} ({n2.get('sid','')})\n\n")
-                            parts6.append(_rewrite_awrpicture_links_for_node(sec62_2.strip(), n2.get('hostname',''), n2.get('sid','')) + "\n\n")
+                            parts6.append(f"### {host2} ({sid2})\n\n")
+                            parts6.append(_rewrite_awrpicture_links_for_node(sec62_2.strip(), host2, sid2) + "\n\n")
                         parts6.append("综合结论：【请填写结论】\n\n")
                         parts6.append("---\n\n")
                     if sec63_1 or sec63_2:
                         parts6.append("## 6.3. 数据库等待事件\n\n")
                         if sec63_1:
-                            parts6.append(f"### {n1.get('hostname','')} ({n1.get('sid','')})\n\n")
-                            parts6.append(_rewrite_awrpicture_links_for_node(sec63_1.strip(), n1.get('hostname',''), n1.get('sid','')) + "\n\n")
+                            parts6.append(f"### {host1} ({sid1})\n\n")
+                            parts6.append(_rewrite_awrpicture_links_for_node(sec63_1.strip(), host1, sid1) + "\n\n")
                         if sec63_2:
-                            parts6.append(f"### {n2.get('hostname','')} ({n2.get('sid','')})\n\n")
-                            parts6.append(_rewrite_awrpicture_links_for_node(sec63_2.strip(), n2.get('hostname',''), n2.get('sid','')) + "\n\n")
+                            parts6.append(f"### {host2} ({sid2})\n\n")
+                            parts6.append(_rewrite_awrpicture_links_for_node(sec63_2.strip(), host2, sid2) + "\n\n")
                         parts6.append("综合结论：【请填写结论】\n\n")
                         parts6.append("---\n\n")
                     if sec64_1 or sec64_2:
                         parts6.append("## 6.4. TOP SQL\n\n")
                         if sec64_1:
-                            parts6.append(f"### {n1.get('hostname','')} ({n1.get('sid','')})\n\n")
-                            parts6.append(_rewrite_awrpicture_links_for_node(sec64_1.strip(), n1.get('hostname',''), n1.get('sid','')) + "\n\n")
+                            parts6.append(f"### {host1} ({sid1})\n\n")
+                            parts6.append(_rewrite_awrpicture_links_for_node(sec64_1.strip(), host1, sid1) + "\n\n")
                         if sec64_2:
-                            parts6.append(f"### {n2.get('hostname','')} ({n2.get('sid','')})\n\n")
-                            parts6.append(_rewrite_awrpicture_links_for_node(sec64_2.strip(), n2.get('hostname',''), n2.get('sid','')) + "\n\n")
+                            parts6.append(f"### {host2} ({sid2})\n\n")
+                            parts6.append(_rewrite_awrpicture_links_for_node(sec64_2.strip(), host2, sid2) + "\n\n")
                         parts6.append("综合结论：【请填写结论】\n\n")
                         parts6.append("---\n\n")
                     # 6.5 - 统一评估标题 + 结论占位
                     parts6.append("## 6.5. 数据库实例负载整体评估\n\n")
                     parts6.append("综合结论：【请填写结论】\n\n")
-                content += "".join(parts6)
+                content_parts.extend(parts6)
     except Exception as e:
         logger.warning(f"生成第6章数据库性能检查失败: {e}")
     # 在所有代码块（```...```）结束后自动插入一条分割线，增强可读性
-    content = _add_hr_after_code_blocks(content)
-    rac_md_path.write_text(content, encoding='utf-8')
+    # 注意：该处理需要完整文档（代码块配对可能跨章节），因此不能逐章节流式写出
+    content = _add_hr_after_code_blocks("".join(content_parts))
+    # 分块写入 1MiB 缓冲的文本流：每块单独编码，避免整份文档一次编码出等大的 bytes 副本
+    with rac_md_path.open('w', encoding='utf-8', buffering=1 << 20) as fh:
+        for i in range(0, len(content), _WRITE_CHUNK_CHARS):
+            fh.write(content[i:i + _WRITE_CHUNK_CHARS])
 
     if not quiet:
         logger.info(f"RAC 初始Markdown已生成: {rac_md_path}")
 
     # 生成 RAC 可编辑HTML，并清理节点级 MD/HTML
     try:
-        conv = MarkdownToPdfConverter()
+        conv = _get_converter()
         ok, editable_path = conv.generate_editable_html(
             md_file=str(rac_md_path),
             output_dir=str(target_dir),
@@ -1103,37 +1203,54 @@ __all__.append('create_rac_md')
 def _add_hr_after_code_blocks(text: str) -> str:
     """在每个 Markdown 代码块关闭标记后追加分割线（---）。"""
     try:
-        pattern = re.compile(r"(^```[^\n]*\n[\s\S]*?\n```[ \t]*\n?)(?!\n?---)", re.MULTILINE)
-        new_text = pattern.sub(lambda m: m.group(1) + "\n---\n\n", text)
-        # 折叠相邻或被空行分隔的重复分割线
-        def collapse_hr(s: str) -> str:
-            prev = None
-            cur = s
-            hr_dup = re.compile(r"(?m)^(?:\s*\n)*---\s*\n(?:\s*\n)*---\s*\n")
-            for _ in range(5):
-                prev = cur
-                cur = hr_dup.sub("\n---\n\n", cur)
-                if cur == prev:
-                    break
-            return cur
-        return collapse_hr(new_text)
+        new_text = _RE_HR_PATTERN.sub(r"\1\n---\n\n", text)
+        # 折叠相邻或被空行分隔的重复分割线：整段连续分割线一次匹配，单遍完成
+        return _RE_HR_RUN.sub("\n---\n\n", new_text)
     except Exception:
         return text
 
+@functools.lru_cache(maxsize=8)
+def _read_md_cached(path_str: str, mtime_ns: int, size: int) -> str:
+    return Path(path_str).read_text(encoding='utf-8', errors='ignore')
+
+
+def _read_md_text(md_path: Path) -> str:
+    """读取单节点 MD 文本。
+
+    按 (路径, mtime, size) 缓存：各章节提取器反复读取同一节点 MD 时只读盘解码一次，
+    文件被改写后缓存键随之变化。
+    """
+    st = md_path.stat()
+    return _read_md_cached(str(md_path), st.st_mtime_ns, st.st_size)
+
+
+def _list_md_files(dir_path: Path) -> Tuple[Path, ...]:
+    """列出目录下的 *.md（按文件名排序，与 Path.glob("*.md") 匹配集合一致）。
+
+    单次 scandir 列出，调用方在同一次定位中复用结果；不跨调用缓存，目录中新增的文件总能被看到。
+    """
+    try:
+        with os.scandir(dir_path) as it:
+            names = sorted(e.name for e in it if e.name.endswith('.md'))
+    except OSError:
+        return ()
+    return tuple(dir_path / name for name in names)
+
+
 def _guess_support_fields_from_md(dir_path: Path) -> Tuple[Optional[str], Optional[str]]:
     """从已生成的单节点MD中提取 支持工程师/支持时长 字段。
 
     Returns: (supname, suptime)
     """
     try:
-        for md in sorted(dir_path.glob("*.md")):
+        for md in _list_md_files(dir_path):
             try:
-                text = md.read_text(encoding='utf-8', errors='ignore')
+                text = _read_md_text(md)
             except Exception:
                 continue
             # | 支持工程师 | 王力 |
-            m_name = re.search(r"\|\s*支持工程师\s*\|\s*([^|\n]+?)\s*\|", text)
-            m_time = re.search(r"\|\s*现场支持总时间（小时）\s*\|\s*([^|\n]+?)\s*\|", text)
+            m_name = _RE_SUPNAME.search(text)
+            m_time = _RE_SUPTIME.search(text)
             supname = m_name.group(1).strip() if m_name else None
             suptime = m_time.group(1).strip() if m_time else None
             if supname or suptime:
@@ -1143,68 +1260,88 @@ def _guess_support_fields_from_md(dir_path: Path) -> Tuple[Optional[str], Option
     return None, None
 
 
-def _find_node_md_by_sid(dir_path: Path, sid: str) -> Optional[Path]:
-    """在目标目录下根据 SID 推断该节点的单机 MD 文件路径。"""
+def _find_node_md_by_sid(dir_path: Path, sid: str, hostname: Optional[str] = None) -> Optional[Path]:
+    """在目标目录下根据 SID 推断该节点的单机 MD 文件路径。
+
+    已知 hostname 时先直接探测标准文件名 {hostname}_{sid}.md，命中则无需列目录。
+    """
+    if hostname:
+        direct = dir_path / f"{hostname}_{sid}.md"
+        if not direct.name.endswith('.rac.md') and direct.is_file():
+            return direct
+    # 排除最终 rac.md
+    cands = [c for c in _list_md_files(dir_path) if not c.name.endswith('.rac.md')]
     # 优先模式：*_{sid}.md
-    cands = sorted(dir_path.glob(f"*_{sid}.md"))
+    suffix = f"_{sid}.md"
     for c in cands:
-        # 排除最终 rac.md
-        if c.name.endswith('.rac.md'):
-            continue
-        return c
+        if c.name.endswith(suffix):
+            return c
     # 次选：包含 sid 的 md
-    for c in sorted(dir_path.glob("*.md")):
-        if c.name.endswith('.rac.md'):
-            continue
+    for c in cands:
         if sid in c.stem:
             return c
     return None
 
 
-def _parse_system_hardware_table_from_md(md_path: Path) -> Tuple[List[str], Dict[str, Tuple[str, str]]]:
+def _is_sep_row(row: str) -> bool:
+    """是否为表格分隔行（含 "| --- |" 形式的单元格）。
+
+    不含 "-" 的行（绝大多数数据行）直接判否，无需进入正则。
+    """
+    return '-' in row and _RE_TABLE_SEP.search(row) is not None
+
+
+def _first_md_table_rows(text: str, pos: int) -> List[str]:
+    """定位 pos 之后的首个 Markdown 表格，返回其数据行（已去除表头与分隔线）。
+
+    整块表格由一次正则匹配截取，避免对文件剩余部分逐行 splitlines + strip 扫描。
+    """
+    m = _RE_MD_TABLE_BLOCK.search(text, pos)
+    if not m:
+        return []
+    rows = [r for r in m.group(0).split("\n") if r and not _is_sep_row(r)]
+    # 第一行为表头，跳过
+    return rows[1:]
+
+
+@dataclass
+class _KeyTable:
+    """键值表（配置项 | 配置值 | 说明）。
+
+    值与说明分列两个字典存放，键顺序即首次出现顺序。
+    """
+    values: Dict[str, str] = field(default_factory=dict)
+    descs: Dict[str, str] = field(default_factory=dict)
+
+    def set(self, key: str, value: str, desc: str) -> None:
+        self.values[key] = value
+        self.descs[key] = desc
+
+
+def _parse_system_hardware_table_from_md(md_path: Path) -> _KeyTable:
     """从单节点 MD 中提取“3.1. 系统硬件配置”表格。
 
-    返回 (keys_order, mapping)
-    mapping: key -> (value, desc)
+    返回 _KeyTable，键顺序为表格行顺序（重复键保留首次出现）。
     """
-    text = md_path.read_text(encoding='utf-8', errors='ignore')
+    table = _KeyTable()
+    text = _read_md_text(md_path)
     # 定位章节
     start = text.find("## 3.1. 系统硬件配置")
     if start == -1:
-        return [], {}
-    # 获取从该位置开始的子串
-    sub = text[start:]
-    lines = sub.splitlines()
-    # 跳过标题行，找到以 '|' 开始的表格
-    table_lines: List[str] = []
-    in_table = False
-    for ln in lines[1:]:
-        if ln.strip().startswith('|'):
-            in_table = True
-            table_lines.append(ln)
-        else:
-            if in_table:
-                break
-    if not table_lines:
-        return [], {}
-    # 解析表格（忽略表头与分隔线）
-    rows = [r for r in table_lines if re.search(r"\|\s*-+\s*\|", r) is None]
-    # 第一行为表头，跳过
-    if rows:
-        rows = rows[1:]
-    order: List[str] = []
-    mapping: Dict[str, Tuple[str, str]] = {}
+        return table
+    # 跳过标题行，取其后的首个表格
+    eol = text.find("\n", start)
+    if eol == -1:
+        return table
+    rows = _first_md_table_rows(text, eol + 1)
     for r in rows:
         seg = [s.strip() for s in r.strip().strip('|').split('|')]
         if len(seg) < 3:
             continue
         key = seg[0]
-        val = seg[1]
-        desc = seg[2]
-        if key and key not in mapping:
-            order.append(key)
-            mapping[key] = (val, desc)
-    return order, mapping
+        if key and key not in table.values:
+            table.set(key, seg[1], seg[2])
+    return table
 
 
 def _build_dual_node_system_hardware_table(
@@ -1220,14 +1357,14 @@ def _build_dual_node_system_hardware_table(
     Header: | SR | SRVVal({sid1}) | SRVVal({sid2}) | 说明 |
     顺序：以节点1的键顺序为主，追加节点2中缺失键。
     """
-    order1, map1 = _parse_system_hardware_table_from_md(md1)
-    order2, map2 = _parse_system_hardware_table_from_md(md2)
+    t1 = _parse_system_hardware_table_from_md(md1)
+    t2 = _parse_system_hardware_table_from_md(md2)
+    values1, descs1 = t1.values, t1.descs
+    values2, descs2 = t2.values, t2.descs
 
     # 构造顺序
-    keys: List[str] = list(order1)
-    for k in order2:
-        if k not in keys:
-            keys.append(k)
+    keys: List[str] = list(values1)
+    keys.extend(k for k in values2 if k not in values1)
 
     col1 = hostname1 or 'sid1'
     col2 = hostname2 or 'sid2'
@@ -1235,58 +1372,37 @@ def _build_dual_node_system_hardware_table(
     header = f"| 计算节点参数名 | 计算节点一 | 计算节点二 | 说明 |\n|---|---|---|---|\n"
     lines: List[str] = []
     for k in keys:
-        v1, d1 = map1.get(k, ("", ""))
-        v2, d2 = map2.get(k, ("", d1))
-        desc = d1 or d2
-        lines.append(f"| {k} | {v1} | {v2} | {desc} |")
+        d1 = descs1.get(k, "")
+        desc = d1 or descs2.get(k, "")
+        lines.append(f"| {k} | {values1.get(k, '')} | {values2.get(k, '')} | {desc} |")
     return header + "\n".join(lines)
 
 
-def _parse_named_table_from_md(md_path: Path, title_zh: str) -> Dict[str, Tuple[str, str]]:
-    """解析以加粗标题（如 **数据库基本信息：**）开头的第一个表格为映射。
+def _parse_named_table_from_md(md_path: Path, title_zh: str) -> _KeyTable:
+    """解析以加粗标题（如 **数据库基本信息：**）开头的第一个表格为 _KeyTable。
 
-    返回: key -> (value, desc)
+    重复键以最后一次出现的值为准。
     """
-    text = md_path.read_text(encoding='utf-8', errors='ignore')
+    table = _KeyTable()
+    text = _read_md_text(md_path)
     # 定位加粗段落，允许有全角/半角 冒号
-    # 允许粗体内包含中文或英文冒号：**数据库基本信息：** 或 **数据库基本信息**
-    pattern = rf"\*\*\s*{re.escape(title_zh)}\s*[：:]?\s*\*\*"
-    m = re.search(pattern, text)
+    m = _named_table_re(title_zh).search(text)
     if not m:
-        return {}
-    start = m.end()
-    sub = text[start:]
-    table_lines: List[str] = []
-    in_table = False
-    for ln in sub.splitlines():
-        if ln.strip().startswith('|'):
-            in_table = True
-            table_lines.append(ln)
-        else:
-            if in_table:
-                break
-    if not table_lines:
-        return {}
-    # 跳过分隔线
-    rows = [r for r in table_lines if re.search(r"\|\s*-+\s*\|", r) is None]
-    # 第1行为表头
-    if rows:
-        rows = rows[1:]
-    mapping: Dict[str, Tuple[str, str]] = {}
+        return table
+    rows = _first_md_table_rows(text, m.end())
     for r in rows:
         seg = [s.strip() for s in r.strip().strip('|').split('|')]
         if len(seg) < 3:
             continue
-        key, val, desc = seg[0], seg[1], seg[2]
-        mapping[key] = (val, desc)
-    return mapping
+        table.set(seg[0], seg[1], seg[2])
+    return table
 
 
 def _build_db_basic_info_combined_table(
     sid1: str,
-    map1: Dict[str, Tuple[str, str]],
+    t1: _KeyTable,
     sid2: str,
-    map2: Dict[str, Tuple[str, str]],
+    t2: _KeyTable,
     hostname1: Optional[str] = None,
     hostname2: Optional[str] = None,
 ) -> str:
@@ -1343,34 +1459,35 @@ def _build_db_basic_info_combined_table(
         "LOG_MEMBERS_PER_GROUP",
         "ONLINE_LOGS_SAME_SIZE",
     ]
-    multiline_keys: List[str] = [
+    multiline_keys: Tuple[str, ...] = (
         "DB_SID", "CURRENT_SESSION", "HOST_NAME", "STARTUP_TIME", "LOG_MODE", "ARCHIVE_MODE"
-    ]
+    )
+
+    values1, descs1 = t1.values, t1.descs
+    values2, descs2 = t2.values, t2.descs
 
     # 合并键集合
-    all_keys: List[str] = []
-    for k in canonical_order:
-        if (k in map1) or (k in map2) or (k in default_desc):
-            all_keys.append(k)
-    # 追加未知键
-    for k in sorted(set(list(map1.keys()) + list(map2.keys()))):
-        if k not in all_keys:
-            all_keys.append(k)
+    all_keys: List[str] = [
+        k for k in canonical_order
+        if (k in values1) or (k in values2) or (k in default_desc)
+    ]
+    # 追加未知键（仅对未知键排序）
+    all_keys.extend(sorted((values1.keys() | values2.keys()).difference(all_keys)))
 
     # 先构建四列表（六个关键字段）
     header_4 = f"| 配置项 | 计算节点一 | 计算节点二 | 说明 |\n|---|---|---|---|\n"
     rows_4: List[str] = []
     for key in multiline_keys:
-        desc_name = map1.get(key, (None, None))[1] or map2.get(key, (None, None))[1] or default_desc.get(key, "")
+        desc_name = descs1.get(key) or descs2.get(key) or default_desc.get(key, "")
         if key == "DB_SID":
             v1 = sid1
             v2 = sid2
         elif key == "HOST_NAME":
-            v1 = hostname1 or map1.get(key, ("", ""))[0]
-            v2 = hostname2 or map2.get(key, ("", ""))[0]
+            v1 = hostname1 or values1.get(key, "")
+            v2 = hostname2 or values2.get(key, "")
         else:
-            v1 = map1.get(key, ("", ""))[0]
-            v2 = map2.get(key, ("", ""))[0]
+            v1 = values1.get(key, "")
+            v2 = values2.get(key, "")
         # 若两个值均为空，跳过该行
         if not (str(v1).strip() or str(v2).strip()):
             continue
@@ -1380,13 +1497,12 @@ def _build_db_basic_info_combined_table(
 
     # 再构建三列表（其余字段）
     header_3 = "| 配置项 | 配置值 | 说明 |\n|---|---|---|\n"
-    rows_3: List[str] = []
-    for key in all_keys:
-        if key in multiline_keys:
-            continue
-        desc_name = map1.get(key, (None, None))[1] or map2.get(key, (None, None))[1] or default_desc.get(key, "")
-        v = map1.get(key, ("", ""))[0] or map2.get(key, ("", ""))[0]
-        rows_3.append(f"| {key} | {v} | {desc_name} |")
+    rows_3: List[str] = [
+        f"| {key} | {values1.get(key, '') or values2.get(key, '')} | "
+        f"{descs1.get(key) or descs2.get(key) or default_desc.get(key, '')} |"
+        for key in all_keys
+        if key not in multiline_keys
+    ]
 
     table_3 = header_3 + "\n".join(rows_3) if rows_3 else ""
 
@@ -1400,9 +1516,9 @@ def _build_db_basic_info_combined_table(
 
 def _build_db_space_info_combined_table(
     sid1: str,
-    map1: Dict[str, Tuple[str, str]],
+    t1: _KeyTable,
     sid2: str,
-    map2: Dict[str, Tuple[str, str]],
+    t2: _KeyTable,
 ) -> str:
     """构造“数据库使用空间”三列表，配置值一列按节点分行显示。
 
@@ -1420,18 +1536,20 @@ def _build_db_space_info_combined_table(
         (["UNDOTBS2"], "撤销表空间2大小"),
     ]
 
+    values1 = t1.values
+    values2 = t2.values
     header = "| 配置项 | 配置值 | 说明 |\n|---|---|---|\n"
     lines: List[str] = []
     for keys, desc_name in key_variants:
         # 选择显示名（优先节点1的键名，否则节点2）
         display_key = None
         for k in keys:
-            if k in map1:
+            if k in values1:
                 display_key = k
                 break
         if not display_key:
             for k in keys:
-                if k in map2:
+                if k in values2:
                     display_key = k
                     break
         if not display_key:
@@ -1440,12 +1558,12 @@ def _build_db_space_info_combined_table(
         v1 = ""
         v2 = ""
         for k in keys:
-            if k in map1:
-                v1 = map1[k][0]
+            if k in values1:
+                v1 = values1[k]
                 break
         for k in keys:
-            if k in map2:
-                v2 = map2[k][0]
+            if k in values2:
+                v2 = values2[k]
                 break
         # RAC 两节点通常共享存储，空间统计相同；保持单机展示逻辑，单值展示（优先节点1，缺则节点2）
         value_cell = v1 or v2
@@ -1455,9 +1573,9 @@ def _build_db_space_info_combined_table(
 
 def _build_node_key_table(
     sid1: str,
-    map1: Dict[str, Tuple[str, str]],
+    t1: _KeyTable,
     sid2: str,
-    map2: Dict[str, Tuple[str, str]],
+    t2: _KeyTable,
     keys: List[str],
     header_prefix: str = "SRVVal",
 ) -> str:
@@ -1466,11 +1584,13 @@ def _build_node_key_table(
     lines: List[str] = []
     for key in keys:
         # 节点1
-        v1, d1 = map1.get(key, ("", ""))
+        v1 = t1.values.get(key, "")
+        d1 = t1.descs.get(key, "")
         label1 = f"{header_prefix}({sid1})" if header_prefix else f"{sid1}"
         lines.append(f"| {label1} | {key} | {v1} | {d1} |")
         # 节点2
-        v2, d2 = map2.get(key, ("", d1))
+        v2 = t2.values.get(key, "")
+        d2 = t2.descs.get(key, d1)
         label2 = f"{header_prefix}({sid2})" if header_prefix else f"{sid2}"
         lines.append(f"| {label2} | {key} | {v2} | {d2} |")
     return header + "\n".join(lines)
@@ -1487,17 +1607,47 @@ def _find_health_check_path(nodes: List[Dict[str, Any]]) -> Optional[Path]:
     return None
 
 
-def _parse_log_config_from_health_check(hc_path: Path, sid1: str, sid2: str) -> Tuple[Dict[str, Tuple[str, str]], Dict[str, Tuple[str, str]]]:
-    """从 04_health_check.txt 中解析 C1. 重要日志文件路径，返回两个节点的映射。
+def _parse_health_check_all(
+    hc_path: Path,
+    sid1: str,
+    sid2: str,
+) -> Tuple[Optional[Tuple[_KeyTable, _KeyTable]], Optional[int], Optional[str]]:
+    """一次读取 04_health_check.txt，解析日志配置、控制文件数量与在线日志大小一致性。
+
+    文件只读盘解码一次，三项解析共用同一份文本。各项解析相互独立，单项失败只记录告警。
+
+    Returns: ((log_table1, log_table2) | None, ctrl_count | None, same_size_flag | None)
+    """
+    logs = None
+    ctrl_count = None
+    same_size_flag = None
+    try:
+        text = hc_path.read_text(encoding='utf-8', errors='ignore')
+    except Exception as e:
+        logger.warning(f"读取健康检查文件失败 {hc_path}: {e}")
+        return logs, ctrl_count, same_size_flag
+    try:
+        logs = _parse_log_config_from_health_check(text, sid1, sid2)
+    except Exception as e:
+        logger.warning(f"解析日志配置失败: {e}")
+    try:
+        ctrl_count = _parse_control_file_count(text)
+    except Exception as e:
+        logger.warning(f"解析控制文件数量失败: {e}")
+    try:
+        same_size_flag = _parse_online_logs_same_size(text)
+    except Exception as e:
+        logger.warning(f"解析在线日志大小一致性失败: {e}")
+    return logs, ctrl_count, same_size_flag
+
 
-    返回 map: key -> (value, desc)，key 为：
+def _parse_log_config_from_health_check(text: str, sid1: str, sid2: str) -> Tuple[_KeyTable, _KeyTable]:
+    """从 04_health_check.txt 文本中解析 C1. 重要日志文件路径，返回两个节点的 _KeyTable。
+
+    key 为：
     - ALERT_LOG_PATH, AUDIT_FILE_DEST_PATH, CORE_DUMP_DEST_PATH, DIAGNOSTIC_DEST_PATH, USER_DUMP_DEST_PATH
     """
-    text = hc_path.read_text(encoding='utf-8', errors='ignore')
     # 在全文件范围内通过关键字提取（不依赖行号）
-    # 允许 AUDIT_FIL_DEST 的拼写变体
-    pat = re.compile(r"^\s*(\d+)\s+(ALERT_LOG|AUDIT_FILE_DEST|AUDIT_FIL_DEST|CORE_DUMP_DEST|DIAGNOSTIC_DEST|USER_DUMP_DEST)\s+(.+?)\s*$",
-                     re.MULTILINE)
 
     # 描述映射
     desc_map = {
@@ -1516,112 +1666,105 @@ def _parse_log_config_from_health_check(hc_path: Path, sid1: str, sid2: str) ->
         'USER_DUMP_DEST': 'USER_DUMP_DEST_PATH',
     }
 
-    map1: Dict[str, Tuple[str, str]] = {}
-    map2: Dict[str, Tuple[str, str]] = {}
+    t1 = _KeyTable()
+    t2 = _KeyTable()
 
-    for m in pat.finditer(text):
+    for m in _RE_LOG_LINE.finditer(text):
         inst = m.group(1)
-        param = m.group(2)
-        val = m.group(3).strip()
-        key = key_map.get(param)
+        key = key_map.get(m.group(2))
         if not key:
             continue
+        val = m.group(3).strip()
         desc = desc_map[key]
         if inst == '1':
-            map1[key] = (val, desc)
+            t1.set(key, val, desc)
         elif inst == '2':
-            map2[key] = (val, desc)
+            t2.set(key, val, desc)
 
     # 确保所有键存在（若缺失则置空）
-    for k in desc_map.keys():
-        map1.setdefault(k, ("", desc_map[k]))
-        map2.setdefault(k, ("", desc_map[k]))
+    for k, desc in desc_map.items():
+        for t in (t1, t2):
+            if k not in t.values:
+                t.set(k, "", desc)
 
-    return map1, map2
+    return t1, t2
 
 
-def _parse_control_file_count(hc_path: Path) -> Optional[int]:
-    """从 04_health_check.txt 的 'C2. 控制文件路径' 段落中统计控制文件数量。
+def _parse_control_file_count(text: str) -> Optional[int]:
+    """从 04_health_check.txt 文本的 'C2. 控制文件路径' 段落中统计控制文件数量。
 
     仅使用关键字定位：先定位标题，再截取到下一小节标题，最后按行匹配路径。
     """
-    text = hc_path.read_text(encoding='utf-8', errors='ignore')
     # 1) 标题定位（允许任意空白/标点差异）
-    m = re.search(r"(?im)^\s*C2\.\s*.*?控制文件路径\s*$", text)
+    m = _RE_C2_TITLE.search(text)
     if not m:
         return None
     start = m.end()
     # 2) 找到下一节标题的开始位置（如 C3. 或 8. 开头的标题）
-    m_next = re.search(r"(?im)^\s*(?:C\d+\.|\d+\.)\s*", text[start:])
-    end = start + m_next.start() if m_next else len(text)
+    m_next = _RE_HC_NEXT_TITLE.search(text, start)
+    end = m_next.start() if m_next else len(text)
     block = text[start:end]
 
     # 3) 在 block 中匹配路径行：以 + 或 / 开头的非空白字符串
-    #    同时忽略表头和分隔线
-    paths: List[str] = []
+    #    同时忽略表头；分隔线不含 + 或 /，无需单独判断
+    count = 0
     for line in block.splitlines():
         s = line.strip()
         if not s:
             continue
         if 'CONTROL_FILE_PATH' in s:
             continue
-        if re.match(r"^[\-\s]+$", s):
-            continue
-        m_path = re.match(r"^([+/][^\s]+)$", s)
-        if m_path:
-            paths.append(m_path.group(1))
-        else:
+        if s[0] in '+/' and len(s) > 1 and len(s.split(None, 1)) == 1:
+            count += 1
+        elif ('+' in s or '/' in s) and _RE_CONTROLFILE_LOOSE.search(s):
             # 宽松回退：捕捉包含 controlfile 的路径片段
-            m2 = re.search(r"([+/]\S*controlfile\S*)", s, re.IGNORECASE)
-            if m2:
-                paths.append(m2.group(1))
-    return len(paths) if paths else None
+            count += 1
+    return count or None
 
 
-def _parse_online_logs_same_size(hc_path: Path) -> Optional[str]:
-    """从 04_health_check.txt 的 '8.日志文件信息' 表格判断在线日志大小是否一致。
+def _parse_online_logs_same_size(text: str) -> Optional[str]:
+    """从 04_health_check.txt 文本的 '8.日志文件信息' 表格判断在线日志大小是否一致。
 
     返回：'是' | '否' | None（无法判断）
     """
-    text = hc_path.read_text(encoding='utf-8', errors='ignore')
     # 找到段落
-    m = re.search(r"\b8\.\s*日志文件信息", text)
+    m = _RE_LOGFILE_TITLE.search(text)
     if not m:
         return None
-    sub = text[m.end():]
 
-    lines = sub.splitlines()
-    header_idx = None
-    for idx, line in enumerate(lines):
+    # 找到表头后继续消费同一迭代器读取数据行
+    lines = iter(text[m.end():].splitlines())
+    header_line = None
+    for line in lines:
         if 'INST_ID' in line and 'MBYTES' in line:
-            header_idx = idx
+            header_line = line
             break
-    if header_idx is None:
+    if header_line is None:
         return None
     # 提取表头列名，计算 MBYTES 列索引
-    header_cols = re.split(r"\s+", lines[header_idx].strip())
+    header_cols = header_line.split()
     try:
         mbytes_idx = header_cols.index('MBYTES')
     except ValueError:
         return None
 
     sizes: Set[str] = set()
-    for line in lines[header_idx+1:]:
+    for line in lines:
         s = line.strip()
         if not s:
             continue
         if s.lower().startswith('total'):
             break
-        if re.match(r"^[\-\s]+$", s):
+        if _RE_SEP.match(s):
             continue
-        # 数据行一般以数字开头
-        if not re.match(r"^\d+\s+", s):
+        cols = s.split()
+        # 数据行一般以数字开头（首列为纯数字且其后还有列）
+        if not (len(cols) > 1 and cols[0].isdecimal()):
             # 可能到了下一段
             # 若遇到像 "C" 或 数字. 标题，终止
-            if re.match(r"^[A-Z]?\d+\.", s):
+            if _RE_HC_SUBTITLE.match(s):
                 break
             continue
-        cols = re.split(r"\s+", s)
         if len(cols) <= mbytes_idx:
             continue
         sizes.add(cols[mbytes_idx])
@@ -1633,15 +1776,16 @@ def _parse_online_logs_same_size(hc_path: Path) -> Optional[str]:
 
 def _extract_disk_space_table_from_md(md_path: Path) -> Optional[str]:
     """从单节点MD提取 4.4 磁盘空间使用率 表格（首个表格）。"""
-    text = md_path.read_text(encoding='utf-8', errors='ignore')
+    text = _read_md_text(md_path)
     # 兼容 "## 4.4.磁盘空间使用率" 或 "## 4.4. 磁盘空间使用率"
-    m = re.search(r"(?m)^##\s*4\.4\.?\s*.*磁盘空间使用率\s*$", text)
+    m = _RE_SEC_4_4.search(text)
     if not m:
         return None
-    sub = text[m.end():]
     table_lines: List[str] = []
     in_table = False
-    for ln in sub.splitlines():
+    # 只切分标题到下一个 # 行之间的片段，不再切分后续全文
+    end = text.find('\n#', m.end())
+    for ln in text[m.end():end if end != -1 else len(text)].splitlines():
         if ln.startswith('#'):
             break
         if ln.strip().startswith('|'):
@@ -1693,8 +1837,8 @@ def _build_section_4_content(target_dir: Path, hostname1: str, sid1: str, hostna
     )
 
     # 磁盘空间表格从各自MD提取
-    md1 = _find_node_md_by_sid(target_dir, sid1)
-    md2 = _find_node_md_by_sid(target_dir, sid2)
+    md1 = _find_node_md_by_sid(target_dir, sid1, hostname1)
+    md2 = _find_node_md_by_sid(target_dir, sid2, hostname2)
     table1 = _extract_disk_space_table_from_md(md1) if md1 else None
     table2 = _extract_disk_space_table_from_md(md2) if md2 else None
 
@@ -1708,7 +1852,32 @@ def _build_section_4_content(target_dir: Path, hostname1: str, sid1: str, hostna
     )
 
     # 在4.x各小节之间增加分割线
-    return intro + sec_41 + "---\n\n" + sec_42 + "---\n\n" + sec_43 + "---\n\n" + sec_44
+    return "".join((intro, sec_41, "---\n\n", sec_42, "---\n\n", sec_43, "---\n\n", sec_44))
+
+
+def _customer_system() -> str:
+    """当前模板占位中的客户系统名称（生成器运行时可能改写，故每次读取）。"""
+    return MarkdownConfig.TEMPLATE_PLACEHOLDERS.get("customer_system", "")
+
+
+@functools.lru_cache(maxsize=32)
+def _rman_titles(node_prefix: str, customer_system: str) -> Tuple[str, str, str]:
+    """5.1 RMAN 三段小标题替换文本（备份策略/备份集路径/备份集合明细）。"""
+    head = f"**{node_prefix}{customer_system} Oracle 数据库 "
+    return (
+        head + "RMAN 备份策略如下：**",
+        head + "RMAN 备份集路径如下：**",
+        head + "RMAN 备份集合明细如下：**",
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _adrci_alert_titles(node_prefix: str, customer_system: str) -> Tuple[str, str]:
+    """5.3 ADRCI/ALERT 两段小标题替换文本。"""
+    return (
+        f"**{node_prefix}{customer_system} ADRCI 诊断工具日志检查：**",
+        f"**{node_prefix}{customer_system} ALERT日志检查**：",
+    )
 
 
 def _extract_rman_5_1_body_from_md(md_path: Path, hostname: str, sid: str) -> Optional[str]:
@@ -1719,46 +1888,32 @@ def _extract_rman_5_1_body_from_md(md_path: Path, hostname: str, sid: str) -> Op
     """
     if not md_path or not md_path.exists():
         return None
-    text = md_path.read_text(encoding='utf-8', errors='ignore')
+    text = _read_md_text(md_path)
     # 找起始标题
-    m = re.search(r"(?m)^##\s*5\.1\.?\s*RMAN\s*备份信息\s*$", text)
+    m = _RE_SEC_5_1.search(text)
     if not m:
         return None
     start = m.end()
     # 找到下一个二级标题或章节标题
-    m_next = re.search(r"(?m)^##\s+\d+\.", text[start:])
+    m_next = _RE_NEXT_HEADER.search(text[start:])
     end = start + m_next.start() if m_next else len(text)
     body = text[start:end].strip()
     # 去掉标题行残留及多余空白
     # 删除“综合结论：”行
-    body = re.sub(r"(?m)^\s*综合结论：.*$", "", body).strip()
+    body = _RE_CONCLUSION.sub("", body).strip()
     if not body:
         return None
 
     # 重写三段小标题，加入“节点 {hostname} ({sid}) {customer_system} …”
-    customer_system = MarkdownConfig.TEMPLATE_PLACEHOLDERS.get("customer_system", "")
-    def repl(line_suffix: str) -> str:
-        node_prefix = f"【{sid}】 " if hostname or sid else ""
-        return f"**{node_prefix}{customer_system} Oracle 数据库 {line_suffix}**"
+    node_prefix = f"【{sid}】 " if hostname or sid else ""
+    policy_title, path_title, detail_title = _rman_titles(node_prefix, _customer_system())
 
     # 备份策略
-    body = re.sub(
-        r"(?m)^\*\*.*?Oracle\s*数据库\s*RMAN\s*备份策略如下：\*\*$",
-        repl("RMAN 备份策略如下："),
-        body,
-    )
+    body = _RE_RMAN_POLICY.sub(policy_title, body)
     # 备份集路径
-    body = re.sub(
-        r"(?m)^\*\*.*?Oracle\s*数据库\s*RMAN\s*备份集路径如下：\*\*$",
-        repl("RMAN 备份集路径如下："),
-        body,
-    )
+    body = _RE_RMAN_PATH.sub(path_title, body)
     # 备份集合明细
-    body = re.sub(
-        r"(?m)^\*\*.*?Oracle\s*数据库\s*RMAN\s*备份集合明细如下：\*\*$",
-        repl("RMAN 备份集合明细如下："),
-        body,
-    )
+    body = _RE_RMAN_DETAIL.sub(detail_title, body)
 
     return body
 
@@ -1769,12 +1924,12 @@ def _extract_dg_5_2_body_from_md(md_path: Path) -> Optional[str]:
     截止到下一个以“## ”开头的同级标题或章节结束。保持原样，不改动内部逻辑。"""
     if not md_path or not md_path.exists():
         return None
-    text = md_path.read_text(encoding='utf-8', errors='ignore')
-    m = re.search(r"(?m)^##\s*5\.2\.?\s*数据库\s*Data\s*Guard\s*容灾\s*$", text)
+    text = _read_md_text(md_path)
+    m = _RE_SEC_5_2.search(text)
     if not m:
         return None
     start = m.end()
-    m_next = re.search(r"(?m)^##\s+\d+\.", text[start:])
+    m_next = _RE_NEXT_HEADER.search(text[start:])
     end = start + m_next.start() if m_next else len(text)
     body = text[start:end].strip()
     return body if body else None
@@ -1788,56 +1943,44 @@ def _extract_5_3_body_from_md(md_path: Path, hostname: str, sid: str) -> Optiona
     """
     if not md_path or not md_path.exists():
         return None
-    text = md_path.read_text(encoding='utf-8', errors='ignore')
-    m = re.search(r"(?m)^##\s*5\.3\.?\s*ADRCI、ALERT\s*日志检查\s*$", text)
+    text = _read_md_text(md_path)
+    m = _RE_SEC_5_3.search(text)
     if not m:
         return None
     start = m.end()
-    m_next = re.search(r"(?m)^##\s+\d+\.", text[start:])
+    m_next = _RE_NEXT_HEADER.search(text[start:])
     end = start + m_next.start() if m_next else len(text)
     body = text[start:end].strip()
-    body = re.sub(r"(?m)^\s*综合结论：.*$", "", body).strip()
+    body = _RE_CONCLUSION.sub("", body).strip()
     if not body:
         return None
 
     # 重写两段小标题，加入“{hostname} ({sid}) {customer_system} …”
-    customer_system = MarkdownConfig.TEMPLATE_PLACEHOLDERS.get("customer_system", "")
     # node_prefix = f"{hostname} ({sid}) " if (hostname or sid) else ""
     node_prefix = f"【{sid}】 " if (hostname or sid) else ""
+    adrci_title, alert_title = _adrci_alert_titles(node_prefix, _customer_system())
     # ADRCI 诊断工具日志检查
-    body = re.sub(
-        r"(?m)^\*\*\s*.*?ADRCI\s*诊断工具日志检查：\s*\*\*\s*$",
-        f"**{node_prefix}{customer_system} ADRCI 诊断工具日志检查：**",
-        body,
-    )
+    body = _RE_ADRCI_TITLE.sub(adrci_title, body)
     # ALERT日志检查（两种形式：带冒号与不带冒号）
-    body = re.sub(
-        r"(?m)^\*\*\s*.*?ALERT日志检查\s*\*\*：\s*$",
-        f"**{node_prefix}{customer_system} ALERT日志检查**：",
-        body,
-    )
-    body = re.sub(
-        r"(?m)^\*\*\s*.*?ALERT日志检查\s*\*\*\s*$",
-        f"**{node_prefix}{customer_system} ALERT日志检查**：",
-        body,
-    )
+    body = _RE_ALERT_TITLE_COLON.sub(alert_title, body)
+    body = _RE_ALERT_TITLE.sub(alert_title, body)
 
     return body
 
 
-def _extract_section_body(md_path: Path, header_patterns: List[str]) -> Optional[str]:
+def _extract_section_body(md_path: Path, header_patterns: Sequence[re.Pattern]) -> Optional[str]:
     """通用：按给定标题正则列表尝试提取某节正文（不含标题），到下一 '## <number>.' 标题或文件末尾。
     第一个命中的模式使用。"""
     if not md_path or not md_path.exists():
         return None
-    text = md_path.read_text(encoding='utf-8', errors='ignore')
+    text = _read_md_text(md_path)
     for pat in header_patterns:
-        m = re.search(pat, text, flags=re.MULTILINE)
+        m = pat.search(text)
         if not m:
             continue
         start = m.end()
         # 截至下一章节标题（支持任意级别 #...）
-        m_next = re.search(r"(?m)^#{1,6}\s+\d+\.\s*", text[start:])
+        m_next = _RE_NEXT_SECTION.search(text[start:])
         end = start + m_next.start() if m_next else len(text)
         body = text[start:end].strip()
         return body if body else None
@@ -1845,45 +1988,41 @@ def _extract_section_body(md_path: Path, header_patterns: List[str]) -> Optional
 
 
 def _extract_5_4_body_from_md(md_path: Path) -> Optional[str]:
-    return _extract_section_body(md_path, [r"(?m)^##\s*5\.4\.?\s*控制文件和在线日志文件\s*$"])
+    return _extract_section_body(md_path, _SECTION_PATTERNS["5.4"])
 
 
 def _extract_5_5_body_from_md(md_path: Path) -> Optional[str]:
-    return _extract_section_body(md_path, [r"(?m)^##\s*5\.5\.?\s*表空间数据文件、归档文件明细\s*$"])
+    return _extract_section_body(md_path, _SECTION_PATTERNS["5.5"])
 
 
 def _extract_5_6_body_from_md(md_path: Path) -> Optional[str]:
-    # 兼容“ASM 磁盘信息”与“ASM磁盘详细信息”
-    return _extract_section_body(md_path, [
-        r"(?m)^##\s*5\.6\.?\s*ASM\s*磁盘信息\s*$",
-        r"(?m)^##\s*5\.6\.?\s*ASM\s*磁盘详细信息\s*$",
-    ])
+    return _extract_section_body(md_path, _SECTION_PATTERNS["5.6"])
 
 
 def _extract_5_7_body_from_md(md_path: Path) -> Optional[str]:
-    return _extract_section_body(md_path, [r"(?m)^##\s*5\.7\.?\s*PL/SQLDeveloper破解版勒索病毒检查\s*$"])
+    return _extract_section_body(md_path, _SECTION_PATTERNS["5.7"])
 
 
 def _strip_conclusion_lines(text: Optional[str]) -> Optional[str]:
     if not text:
         return text
-    return re.sub(r"(?m)^\s*综合结论：.*$", "", text).strip()
+    return _RE_CONCLUSION.sub("", text).strip()
 
 
 def _extract_6_1_body_from_md(md_path: Path) -> Optional[str]:
-    return _strip_conclusion_lines(_extract_section_body(md_path, [r"(?m)^##\s*6\.1\.?\s*数据库实例命中率\s*$"]))
+    return _strip_conclusion_lines(_extract_section_body(md_path, _SECTION_PATTERNS["6.1"]))
 
 
 def _extract_6_2_body_from_md(md_path: Path) -> Optional[str]:
-    return _strip_conclusion_lines(_extract_section_body(md_path, [r"(?m)^##\s*6\.2\.?\s*数据库资源消耗时间模型\s*$"]))
+    return _strip_conclusion_lines(_extract_section_body(md_path, _SECTION_PATTERNS["6.2"]))
 
 
 def _extract_6_3_body_from_md(md_path: Path) -> Optional[str]:
-    return _strip_conclusion_lines(_extract_section_body(md_path, [r"(?m)^##\s*6\.3\.?\s*数据库等待事件\s*$"]))
+    return _strip_conclusion_lines(_extract_section_body(md_path, _SECTION_PATTERNS["6.3"]))
 
 
 def _extract_6_4_body_from_md(md_path: Path) -> Optional[str]:
-    return _strip_conclusion_lines(_extract_section_body(md_path, [r"(?m)^##\s*6\.4\.?\s*TOP\s*SQL\s*$"]))
+    return _strip_conclusion_lines(_extract_section_body(md_path, _SECTION_PATTERNS["6.4"]))
 
 
 def _get_node_file_path_by_key(node: Dict[str, Any], key: str) -> Optional[Path]:
@@ -1934,17 +2073,25 @@ def _extract_crs_info_sections(node: Dict[str, Any]) -> Tuple[Optional[str], Opt
     try:
         lines = p.read_text(encoding='utf-8', errors='ignore').splitlines()
         n = len(lines)
-        # 索引工具
-        def find_line_idx(pattern: str) -> Optional[int]:
-            rx = re.compile(pattern)
-            for i, ln in enumerate(lines):
-                if rx.search(ln):
-                    return i
-            return None
+        # 单次遍历：记录三个标题的首次出现位置及全部分隔线行号
+        crs_start: Optional[int] = None
+        vote_heading: Optional[int] = None
+        ocr_heading: Optional[int] = None
+        sep_positions: List[int] = []
+        for i, ln in enumerate(lines):
+            # 标题与分隔线都含 "="，其余行（绝大多数）只做一次子串判断
+            if '=' not in ln:
+                continue
+            if _RE_SEP_LINE.match(ln):
+                sep_positions.append(i)
+            elif crs_start is None and 'CRS资源状态' in ln and _RE_CRS_HEAD.match(ln):
+                crs_start = i
+            elif vote_heading is None and 'Information' in ln and _RE_VOTE_HEAD.match(ln):
+                vote_heading = i
+            elif ocr_heading is None and 'OCR检查' in ln and _RE_OCR_HEAD.match(ln):
+                ocr_heading = i
 
         # 1) CRS资源状态
-        crs_start = find_line_idx(r"^\s*==\s*CRS资源状态")
-        vote_heading = find_line_idx(r"^\s*==\s*Voting\s+Disk\s+Information\s*==")
         crs_block = None
         if crs_start is not None:
             end = vote_heading if (vote_heading is not None and vote_heading > crs_start) else n
@@ -1952,23 +2099,19 @@ def _extract_crs_info_sections(node: Dict[str, Any]) -> Tuple[Optional[str], Opt
 
         # 2) Voting Disk 信息
         # 起点：Voting heading 上一行的全等号分隔线；终点：OCR heading 上一行的全等号分隔线
-        sep_re = re.compile(r"^\s*=+\s*$")
-        ocr_heading = find_line_idx(r"^\s*==\s*OCR检查")
         vote_block = None
         if vote_heading is not None:
-            # 向上寻找分隔线
+            # 向上寻找分隔线（标题之前最近的一条）
             start_idx = None
-            for i in range(vote_heading - 1, -1, -1):
-                if sep_re.match(lines[i]):
-                    start_idx = i
-                    break
+            k = bisect.bisect_left(sep_positions, vote_heading)
+            if k:
+                start_idx = sep_positions[k - 1]
             # 结束分隔线
             end_idx = n
             if ocr_heading is not None:
-                for i in range(ocr_heading - 1, -1, -1):
-                    if sep_re.match(lines[i]):
-                        end_idx = i
-                        break
+                k = bisect.bisect_left(sep_positions, ocr_heading)
+                if k:
+                    end_idx = sep_positions[k - 1]
             if start_idx is None:
                 # 回退到Voting heading本身
                 start_idx = vote_heading
@@ -1987,37 +2130,46 @@ def _extract_crs_info_sections(node: Dict[str, Any]) -> Tuple[Optional[str], Opt
 
 def _rewrite_awrpicture_links_for_node(text: str, hostname: str, sid: str) -> str:
     """将提取到的6.x小节中的 ./awr_picture/ 路径改写到 {hostname}_{sid}_awr_picture/。"""
-    if not text:
+    # 无 awr_picture 引用（如 6.2/6.3 纯文本小节）时直接返回，免去正则扫描
+    if not text or "awr_picture/" not in text:
         return text
+    # Markdown image or link patterns: (./awr_picture/...) or (awr_picture/...)，以及 HTML src 属性
+    return _RE_AWR_REF.sub(_awr_ref_template(hostname, sid), text)
+
+
+@functools.lru_cache(maxsize=16)
+def _awr_ref_template(hostname: str, sid: str) -> str:
+    """awr_picture 引用改写的替换模板（按节点缓存，6.1~6.4 各小节复用）。"""
     prefix = f"{hostname}_{sid}_awr_picture/" if hostname or sid else "awr_picture/"
-    # Markdown image or link patterns: (./awr_picture/...) or (awr_picture/...)
-    text = re.sub(r"(\()\./?awr_picture/", r"\1" + prefix, text)
-    # HTML src attributes
-    text = re.sub(r"(src=\")[.]/?awr_picture/", r"\1" + prefix, text)
-    text = re.sub(r"(src=')\./?awr_picture/", r"\1" + prefix, text)
-    return text
+    # 使用 \g<1>，避免以数字开头的主机名被解析为组号
+    return r"\g<1>" + prefix.replace("\\", r"\\")
+
+
+# 第6章引言中每个节点展示的 AWR 基础三图
+_CH6_AWR_IMAGES = ("awr_database_info.png", "awr_host_info.png", "awr_snapshot_info.png")
+# 图片行模板：绑定 format 方法，按节点填充时无需重复构造格式串
+_CH6_AWR_IMAGE_LINE = "![AWR截图]({}/{})\n".format
 
 
 def _build_ch6_prelude(hostname1: str, sid1: str, hostname2: str, sid2: str,
                        customer_unit: str, customer_system: str, db_model_display: str) -> str:
     """构建第6章引言与两节点AWR基础三图。"""
-    hs1 = f"{hostname1}_{sid1}_awr_picture"
-    hs2 = f"{hostname2}_{sid2}_awr_picture"
-    intro = (
+    parts: List[str] = [
         "\n# 6. 数据库性能检查\n\n"
-        "数据库的性能情况通过 AWR 的报告来体现。\n\n"
-        f"本报告中选取了{customer_unit}{customer_system} Oracle{db_model_display}数据库系统工作峰值时间段进行分析。\n\n"
-        f"### {hostname1} ({sid1})\n"
-        f"![AWR截图]({hs1}/awr_database_info.png)\n"
-        f"![AWR截图]({hs1}/awr_host_info.png)\n"
-        f"![AWR截图]({hs1}/awr_snapshot_info.png)\n\n"
-        f"### {hostname2} ({sid2})\n"
-        f"![AWR截图]({hs2}/awr_database_info.png)\n"
-        f"![AWR截图]({hs2}/awr_host_info.png)\n"
-        f"![AWR截图]({hs2}/awr_snapshot_info.png)\n\n"
-        "---\n\n"
-    )
-    return intro
+        "数据库的性能情况通过 AWR 的报告来体现。\n\n",
+        f"本报告中选取了{customer_unit}{customer_system} Oracle{db_model_display}数据库系统工作峰值时间段进行分析。\n\n",
+    ]
+    for hostname, sid in ((hostname1, sid1), (hostname2, sid2)):
+        hs = "_".join((hostname, sid, "awr_picture"))
+        parts.append(f"### {hostname} ({sid})\n")
+        parts.extend(_CH6_AWR_IMAGE_LINE(hs, name) for name in _CH6_AWR_IMAGES)
+        parts.append("\n")
+    parts.append("---\n\n")
+    return "".join(parts)
+
+
+# 清理节点文件时逐条输出删除失败告警的上限
+_CLEANUP_WARN_LIMIT = 5
 
 
 def _cleanup_node_md_html(target_dir: Path, rac_md: Path, rac_editable: Path) -> None:
@@ -2026,29 +2178,41 @@ def _cleanup_node_md_html(target_dir: Path, rac_md: Path, rac_editable: Path) ->
     - 仅作用于 {identifier} 目标目录，不跨目录删除。
     - 安全过滤：忽略非 .md/.editable.html 文件。
     """
+    keep_names = {rac_md.name, rac_editable.name}
+    failures: List[str] = []
     try:
-        for f in target_dir.iterdir():
-            if f.is_dir():
-                continue
-            if f == rac_md or f == rac_editable:
-                continue
-            name = f.name
-            if name.endswith('.rac.md') or name.endswith('.rac.editable.html'):
-                # 再保险：保留任何 rac 合并命名
-                continue
-            if name.endswith('.editable.html') or name.endswith('.md'):
-                try:
-                    f.unlink()
-                    logger.info(f"已删除节点文件: {f}")
-                except Exception as e:
-                    logger.warning(f"删除文件失败 {f}: {e}")
+        # scandir 的 DirEntry 自带类型信息，跳过目录/非目标文件时无需逐个 stat
+        with os.scandir(target_dir) as it:
+            for entry in it:
+                if entry.is_dir():
+                    continue
+                name = entry.name
+                if name in keep_names:
+                    continue
+                if name.endswith(('.rac.md', '.rac.editable.html')):
+                    # 再保险：保留任何 rac 合并命名
+                    continue
+                if name.endswith(('.editable.html', '.md')):
+                    try:
+                        os.unlink(entry.path)
+                        logger.info(f"已删除节点文件: {entry.path}")
+                    except Exception as e:
+                        failures.append(f"{entry.path}: {e}")
     except Exception as e:
         logger.warning(f"清理节点MD/HTML失败: {e}")
+    # 删除失败逐条告警；数量较多时合并为一条，避免刷屏
+    if len(failures) > _CLEANUP_WARN_LIMIT:
+        logger.warning(
+            f"删除文件失败 {len(failures)} 个，前 {_CLEANUP_WARN_LIMIT} 个: "
+            + "; ".join(failures[:_CLEANUP_WARN_LIMIT])
+        )
+    else:
+        for item in failures:
+            logger.warning(f"删除文件失败 {item}")
 
 
-def _generate_rac_toc() -> str:
-    """生成RAC专用目录，包含 5.8/5.9 与 6.5。"""
-    return """# 目录
+# RAC专用目录（固定内容），包含 5.8/5.9 与 6.5
+_RAC_TOC = """# 目录
 
 1. [健康检查总结](#1-健康检查总结)
    - 1.1. [健康检查概要](#11-健康检查概要)
@@ -2089,3 +2253,8 @@ def _generate_rac_toc() -> str:
 
 ---
 """
+
+
+def _generate_rac_toc() -> str:
+    """生成RAC专用目录，包含 5.8/5.9 与 6.5。"""
+    return _RAC_TOC
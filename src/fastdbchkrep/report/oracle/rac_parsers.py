@@ -7,25 +7,117 @@ RAC 辅助解析模块
 """
 from __future__ import annotations
 
+import functools
 import json
+import os
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Tuple
 from loguru import logger
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+try:
+    import ijson as _ijson
+except ImportError:
+    _ijson = None
+
+
+# 超过该大小的 JSON（可能内嵌大量原始命令输出）在可用时改用 ijson 流式解析
+_STREAM_THRESHOLD = 4 * 1024 * 1024
+# load_rac_meta 实际使用的顶层字段
+_RAC_FIELDS = frozenset(('dbmodel', 'dbtype', 'identifier', 'metainfo'))
+# metainfo 每个节点必备字段
+_NODE_REQUIRED = frozenset(('hostname', 'sid'))
+
+
+def _load_json_whole(f: BinaryIO) -> Any:
+    """整体读取并解析 JSON；可用时使用 orjson。"""
+    raw = f.read()
+    if _orjson is None:
+        return json.loads(raw.decode('utf-8'))
+    try:
+        return _orjson.loads(raw)
+    except _orjson.JSONDecodeError:
+        # orjson 不接受 NaN/Infinity、超 64 位整数、孤立代理字符等，回退标准库保持兼容
+        return json.loads(raw.decode('utf-8'))
+
+
+def _load_rac_fields_streaming(f: BinaryIO) -> Dict[str, Any]:
+    """以 ijson 事件流单次遍历 JSON，仅构建 _RAC_FIELDS 中的顶层字段。
+
+    其余顶层字段（如原始采集输出）只被扫描、不落入内存。
+    """
+    fields: Dict[str, Any] = {}
+    builder = None
+    building = None
+    for prefix, event, value in _ijson.parse(f, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == building and event in ('end_map', 'end_array'):
+                fields[building] = builder.value
+                builder = None
+                building = None
+            continue
+        if prefix not in _RAC_FIELDS:
+            continue
+        if event in ('start_map', 'start_array'):
+            builder = _ijson.ObjectBuilder()
+            builder.event(event, value)
+            building = prefix
+        else:
+            # 标量值（字符串/数字/布尔/null）
+            fields[prefix] = value
+    return fields
+
+
+def _load_rac_json(f: BinaryIO, size: int) -> Dict[str, Any]:
+    """按文件大小选择解析路径：大文件走 ijson 流式，其余整体读取（优先 orjson）。
+
+    小文件整体解析更快；大文件流式解析只保留所需字段，避免原始输出整体驻留内存。
+    """
+    if _ijson is not None and size > _STREAM_THRESHOLD:
+        return _load_rac_fields_streaming(f)
+    return _load_json_whole(f)
 
 
 def load_rac_meta(json_file: Path) -> Tuple[str, str, List[Dict[str, Any]]]:
     """从 JSON 中加载 RAC 基本信息。
 
+    按 (路径, mtime, size) 缓存解析结果：合并与生成阶段先后读取同一 JSON 时只解析一次。
+
     Returns:
         (dbtype, identifier, metainfo_list)
     Raises:
         ValueError: 当 JSON 不是 RAC 模式或缺少关键字段时。
     """
-    if not json_file.exists():
-        raise ValueError(f"JSON文件不存在: {json_file}")
+    try:
+        st = json_file.stat()
+    except FileNotFoundError as e:
+        raise ValueError(f"JSON文件不存在: {json_file}") from e
+    db_type, identifier, metainfo = _load_rac_meta_cached(str(json_file), st.st_mtime_ns, st.st_size)
+    # 缓存中的节点为只读映射：每次返回新的节点 dict（浅拷贝），嵌套的 files 等结构仍与缓存共享，调用方不应原地修改
+    return db_type, identifier, [dict(node) for node in metainfo]
 
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+
+@functools.lru_cache(maxsize=32)
+def _load_rac_meta_cached(path_str: str, mtime_ns: int, size: int) -> Tuple[str, str, Tuple[Mapping[str, Any], ...]]:
+    db_type, identifier, metainfo = _load_rac_meta_file(Path(path_str))
+    # 仅冻结节点顶层（按节点数计），不递归转换嵌套结构
+    return db_type, identifier, tuple(MappingProxyType(node) for node in metainfo)
+
+
+def _load_rac_meta_file(json_file: Path) -> Tuple[str, str, List[Dict[str, Any]]]:
+    """解析 RAC JSON 并校验关键字段（不缓存）。"""
+    # 直接打开，由 open 报告文件不存在（无需事先 exists 检查）
+    try:
+        f = open(json_file, 'rb')
+    except FileNotFoundError as e:
+        raise ValueError(f"JSON文件不存在: {json_file}") from e
+    with f:
+        data = _load_rac_json(f, os.fstat(f.fileno()).st_size)
 
     db_model = data.get('dbmodel', 'one')
     if db_model != 'rac':
@@ -40,12 +132,21 @@ def load_rac_meta(json_file: Path) -> Tuple[str, str, List[Dict[str, Any]]]:
     if not isinstance(metainfo, list) or not metainfo:
         raise ValueError("JSON缺少metainfo节点列表")
 
-    # 基本字段检查，便于后续构建路径
+    # 驻留批量运行中反复出现的短标识串，后续作为字典键或比较时可走指针相等的快速路径
+    if isinstance(identifier, str):
+        identifier = sys.intern(identifier)
+
+    # 基本字段检查，便于后续构建路径；hostname/sid 驻留后写入新的节点字典，不修改解析结果
+    nodes: List[Dict[str, Any]] = []
     for idx, m in enumerate(metainfo, 1):
-        if 'hostname' not in m or 'sid' not in m:
+        if not isinstance(m, dict):
+            raise ValueError(f"metainfo[{idx}] 不是节点对象: {m!r}")
+        if not _NODE_REQUIRED <= m.keys():
             logger.warning(f"metainfo[{idx}] 缺少 hostname/sid: {m.keys()}")
+        interned = {key: sys.intern(m[key]) for key in _NODE_REQUIRED if type(m.get(key)) is str}
+        nodes.append({**m, **interned} if interned else m)
 
-    return db_type, identifier, metainfo
+    return db_type, identifier, nodes
 
 
 __all__ = [
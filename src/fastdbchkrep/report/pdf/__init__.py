@@ -4,4 +4,4 @@ PDF转换模块 - 将Markdown报告转换为专业的HTML和PDF文档
 
 from .converter import MarkdownToPdfConverter
 
-__all__ = ['MarkdownToPdfConverter']
\ No newline at end of file
+__all__ = ['MarkdownToPdfConverter']
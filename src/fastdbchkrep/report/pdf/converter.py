@@ -3,203 +3,170 @@ Markdown到PDF转换器与可编辑HTML生成器
 说明：在保持既有 Markdown→HTML→PDF 能力的基础上，新增可编辑HTML生成功能，
 以便工程师在HTML阶段填写“建议/综合结论”等内容。
 """
+import functools
+import json
 import re
 import os
+import threading
 try:
-    import markdown as _markdown
+    import orjson as _orjson
 except ImportError:
-    _markdown = None
+    _orjson = None
 from pathlib import Path
 from typing import Tuple, List
 from loguru import logger
 from ..common.config import MarkdownConfig
 
 
-class MarkdownToPdfConverter:
-    """Markdown转PDF转换器最终版"""
-    
-    def __init__(self):
-        """初始化转换器"""
-        self.css_style = self._load_default_css()
-        self.md_content = ""
-        self.html_content = ""
-        self.md_file_path = None
-        self.output_dir = None
-        self.output_name = None
-        
-    def convert(self, md_file: str, output_dir: str, output_name: str) -> Tuple[bool, str, str]:
-        """
-        执行完整的转换流程
-        
-        Args:
-            md_file: Markdown文件路径
-            output_dir: 输出目录路径  
-            output_name: 输出文件名（不含扩展名）
-            
-        Returns:
-            (成功标志, HTML文件路径, PDF文件路径)
-        """
-        try:
-            # 参数验证
-            md_path = Path(md_file)
-            if not md_path.exists():
-                logger.error(f"Markdown文件不存在: {md_file}")
-                return False, "", ""
-                
-            out_path = Path(output_dir)
-            out_path.mkdir(parents=True, exist_ok=True)
-            
-            # 设置实例变量
-            self.md_file_path = md_path
-            self.output_dir = out_path
-            self.output_name = output_name
-            
-            # 读取Markdown内容
-            logger.info(f"读取Markdown文件: {md_file}")
-            with open(md_path, 'r', encoding='utf-8') as f:
-                self.md_content = f.read()
-            
-            # 转换为HTML（需要markdown包）
-            if _markdown is None:
-                logger.error("缺少依赖包: markdown。请安装后重试: pip install markdown")
-                return False, "", ""
-            logger.info("开始转换Markdown到HTML")
-            self.html_content = self._convert_md_to_html()
-            
-            # 保存HTML文件
-            html_file = out_path / f"{output_name}.html"
-            logger.info(f"保存HTML文件: {html_file}")
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(self.html_content)
-            
-            # 转换为PDF
-            pdf_file = out_path / f"{output_name}.pdf"
-            logger.info(f"生成PDF文件: {pdf_file}")
-            success = self._convert_html_to_pdf(str(html_file), str(pdf_file))
-            
-            if success:
-                logger.success(f"转换完成 - HTML: {html_file}, PDF: {pdf_file}")
-                return True, str(html_file), str(pdf_file)
-            else:
-                logger.error("PDF生成失败")
-                return False, str(html_file), ""
-                
-        except Exception as e:
-            logger.error(f"转换过程出错: {e}")
-            return False, "", ""
-
-    def generate_editable_html(self, md_file: str, output_dir: str, output_name: str) -> Tuple[bool, str]:
-        """生成可编辑版HTML文件
-
-        Args:
-            md_file: Markdown文件路径
-            output_dir: 输出目录
-            output_name: 输出文件名（不含扩展名）
-
-        Returns:
-            (成功标志, 可编辑HTML路径)
-        """
-        try:
-            md_path = Path(md_file)
-            if not md_path.exists():
-                logger.error(f"Markdown文件不存在: {md_file}")
-                return False, ""
-
-            out_path = Path(output_dir)
-            out_path.mkdir(parents=True, exist_ok=True)
-
-            # 读取Markdown并转基础HTML
-            self.md_file_path = md_path
-            self.output_dir = out_path
-            self.output_name = output_name
-
-            with open(md_path, 'r', encoding='utf-8') as f:
-                self.md_content = f.read()
-
-            if _markdown is None:
-                logger.error("缺少依赖包: markdown。请安装后重试: pip install markdown")
-                return False, ""
-            base_html = self._convert_md_to_html()
-
-            # 注入可编辑控件、工具条、打印样式
-            editable_html = self._make_html_editable(base_html)
-
-            # 写入可编辑HTML
-            editable_name = f"{output_name}{MarkdownConfig.EDITABLE_HTML_SUFFIX}"
-            editable_file = out_path / editable_name
-            with open(editable_file, 'w', encoding='utf-8') as f:
-                f.write(editable_html)
-
-            logger.info(f"可编辑HTML文件已生成: {editable_file}")
-            return True, str(editable_file)
-        except Exception as e:
-            logger.error(f"生成可编辑HTML失败: {e}")
-            return False, ""
-
-    def html_to_pdf(self, html_file: str, output_dir: str, output_name: str) -> Tuple[bool, str]:
-        """将现有HTML转换为PDF（用于htmltopdf子命令）
-
-        注意：HTML自身应包含打印样式（隐藏编辑UI、保留版式）。
-
-        Returns:
-            (成功标志, PDF路径)
-        """
+# ===============
+# 预编译正则
+# ===============
+
+# 编辑控件注入点
+_RE_HEAD_BODY = re.compile(r'</head>|<body>')
+# 1.2 建议章节标题
+_RE_H2_ADVICE = re.compile(r"<h2[^>]*>\s*1\.2\.[\s\S]*?</h2>")
+# 尚未可编辑的 <td> 起始标签
+_RE_TD_EDITABLE = re.compile(r'<td(?![^>]*contenteditable)[^>]*>')
+# 任一 <h2> 元素（分组为标题内部HTML）
+_RE_H2_ELEMENT = re.compile(r"<h2[^>]*>([\s\S]*?)</h2>")
+# 结论章节锚点 (key, 标题前缀)，不含建议表格
+_CONCL_SECTION_ANCHORS = tuple(
+    (key, anchor) for key, anchor in MarkdownConfig.HTML_SECTION_ANCHORS.items()
+    if key != 'advice_table'
+)
+# "综合结论：【…】" 占位
+_RE_CONCL_PLACEHOLDER = re.compile(MarkdownConfig.CONCLUSION_PLACEHOLDER_PATTERN)
+# <p> 内嵌可编辑结论 <div> 的两种写法，以及空段落
+_RE_CONCL_P_DIV = re.compile(r"<p>\s*综合结论：\s*(<div class=\"editable-conclusion\"[\s\S]*?</div>)\s*</p>")
+_RE_CONCL_STRONG_DIV = re.compile(r"<p>\s*<strong>综合结论：</strong>\s*(<div class=\"editable-conclusion\"[\s\S]*?</div>)\s*</p>")
+_RE_EMPTY_P = re.compile(r"<p>\s*</p>")
+# 服务器类型二选一单元格
+_RE_SERVER_TYPE_TD = re.compile(r'(<td[^>]*>)\s*X86数据库服务器\s*/\s*Oracle ExaData 一体机\s*\(二选一\)\s*(</td>)')
+_SERVER_TYPE_REPL = (r'\1'
+                     r'<span class="field-inline" data-suggest-id="server_type">'
+                     r'<select>'
+                     r'<option value="">请选择</option>'
+                     r'<option value="X86数据库服务器">X86数据库服务器</option>'
+                     r'<option value="Oracle ExaData 一体机">Oracle ExaData 一体机</option>'
+                     r'</select>'
+                     r'</span>'
+                     r'\2')
+# 目录行中的 markdown 链接
+_TOC_LINK_RE = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+# 正文标题元素（分组：级别、属性、内部HTML）、已有 id 属性、任意标签、开头编号
+_RE_HEADING = re.compile(r'<h([1-6])([^>]*)>(.*?)</h\1>', re.DOTALL | re.IGNORECASE)
+_RE_ID_ATTR = re.compile(r'\bid\s*=\s*(["\"])')
+_RE_TAG = re.compile(r'<[^>]+>')
+_RE_NUM_PREFIX = re.compile(r'\s*(\d+)(?:\.(\d+))?')
+# 图片标签及其 src 属性
+_RE_IMG_TAG = re.compile(r'<img[^>]+>')
+_RE_IMG_SRC = re.compile(r'src="([^"]+)"')
+# 3.1 系统硬件配置章节标题、表格 class 属性
+_RE_H2_SYS_HW = re.compile(r"<h2[^>]*>\s*3\.1\.[\s\S]*?</h2>")
+_RE_CLASS_ATTR = re.compile(r'class="([^"]*)"')
+# 列表项内的 <p> 包裹
+_RE_LI_P = re.compile(r'<li>\s*<p>(.*?)</p>\s*</li>', re.DOTALL)
+_RE_LI_P_OPEN = re.compile(r'<li>\s*\n*\s*<p>')
+_RE_P_LI_CLOSE = re.compile(r'</p>\s*\n*\s*</li>')
+# 正文中其后紧跟列表的引导语，需在其后补空行才能被 markdown 识别为列表
+_LIST_TRIGGERS = (
+    '本次数据库性能检查的工具是',
+    '主要从以下方面来检查操作系统的性能',
+    '主要从以下方面',
+    '以下的部分是对操作系统的检查',
+)
+
+
+def _scan_toc_number(text: str) -> Tuple[List[str], int]:
+    """扫描目录文本开头的 "数字(.数字)*" 编号，返回 (各段数字, 编号结束位置)；无编号时为 ([], 0)"""
+    runs = []
+    i, n = 0, len(text)
+    while True:
+        j = i
+        while j < n and text[j].isdecimal():
+            j += 1
+        if j == i:
+            break
+        runs.append(text[i:j])
+        i = j
+        # 只有"."后紧跟数字才算同一编号的下一段
+        if i + 1 < n and text[i] == '.' and text[i + 1].isdecimal():
+            i += 1
+        else:
+            break
+    return runs, i
+
+
+@functools.lru_cache(maxsize=1)
+def _import_markdown():
+    """按需导入 markdown 包（仅 htmltopdf 时不加载）；未安装时返回 None。"""
+    try:
+        import markdown
+    except ImportError:
+        return None
+    return markdown
+
+
+# 正文 Markdown 解析器按线程复用（Markdown 实例非线程安全），避免每篇文档重新加载扩展
+_MD_LOCAL = threading.local()
+
+
+def _get_markdown():
+    """返回当前线程复用的 Markdown 实例（已 reset，可直接 convert）。"""
+    md = getattr(_MD_LOCAL, 'md', None)
+    if md is None:
+        md = _import_markdown().Markdown(
+            extensions=[
+                'tables',
+                'fenced_code',
+                'codehilite',
+                'attr_list'
+            ],
+            extension_configs={
+                'codehilite': {
+                    'linenums': False,
+                    'css_class': 'highlight'
+                }
+            }
+        )
+        _MD_LOCAL.md = md
+    else:
+        md.reset()
+    return md
+
+# 可编辑结论表格（替换"综合结论：【…】"占位）；绑定 format 方法，替换回调只做占位填充
+_CONCL_TABLE_HTML = (
+    '<p><strong>综合结论：</strong></p>\n'
+    '<table data-suggest-id="{table_id}" class="conclusion-table">\n'
+    '<thead>\n'
+    '<tr><th style="width: 60px;">序号</th><th>结论内容</th></tr>\n'
+    '</thead>\n'
+    '<tbody>\n'
+    '<tr><td>1</td><td contenteditable="true"></td></tr>\n'
+    '</tbody>\n'
+    '</table>\n'
+    '<div class="edit-controls" data-target="{table_id}" aria-hidden="false">\n'
+    '<button type="button" onclick="window.__editor.addConclusionRow(\'{table_id}\')">新增结论</button>\n'
+    '<button type="button" onclick="window.__editor.removeConclusionRow(\'{table_id}\')">删除末行</button>\n'
+    '</div>'
+).format
+
+
+def _load_suggestions(sug_path: Path):
+    """读取建议JSON；可用时使用 orjson。"""
+    raw = sug_path.read_bytes()
+    if _orjson is not None:
         try:
-            html_path = Path(html_file)
-            if not html_path.exists():
-                logger.error(f"HTML文件不存在: {html_file}")
-                return False, ""
-
-            out_path = Path(output_dir)
-            out_path.mkdir(parents=True, exist_ok=True)
+            return _orjson.loads(raw)
+        except _orjson.JSONDecodeError:
+            # orjson 不接受 NaN/Infinity 等扩展写法，回退标准库保持兼容
+            pass
+    return json.loads(raw.decode('utf-8'))
 
-            pdf_file = out_path / f"{output_name}.pdf"
-
-            # 自动查找与HTML同目录的建议JSON（<base>.suggestions.json 或 <base>.editable.suggestions.json）
-            suggestions = None
-            base = html_path.name
-            base_no_ext = base[:-len(html_path.suffix)] if html_path.suffix else base
-            # 规范化基名：去除 .editable；保留 .final（如已为最终版）
-            if base_no_ext.endswith('.editable'):
-                base_core = base_no_ext[:-len('.editable')]
-            else:
-                base_core = base_no_ext
-
-            # 读取建议JSON：优先 <core>.suggestions.json；若输入是final且未找到，回退到去掉.final的建议文件
-            sug_candidates = [f"{base_core}{MarkdownConfig.SUGGESTIONS_JSON_SUFFIX}"]
-            if base_core.endswith('.final'):
-                sug_candidates.append(f"{base_core[:-len('.final')]}{MarkdownConfig.SUGGESTIONS_JSON_SUFFIX}")
-            for sug_name in sug_candidates:
-                sug_path = html_path.parent / sug_name
-                if sug_path.exists():
-                    try:
-                        import json as _json
-                        with open(sug_path, 'r', encoding='utf-8') as sf:
-                            suggestions = _json.load(sf)
-                        logger.info(f"检测到建议JSON，已加载: {sug_path}")
-                    except Exception as e:
-                        logger.warning(f"加载建议JSON失败，将忽略: {sug_path}，错误: {e}")
-                    break
 
-            # 在相同目录输出final HTML（若输入已是final，避免生成 .final.final.html）
-            if base_core.endswith('.final'):
-                final_html_path = None  # 已是最终版，跳过另存final HTML
-            else:
-                final_html_name = f"{base_core}.final.html"
-                final_html_path = str(html_path.parent / final_html_name)
-
-            ok = self._convert_html_to_pdf(str(html_path), str(pdf_file), suggestions=suggestions, final_html_path=final_html_path)
-            if ok:
-                logger.success(f"PDF生成成功: {pdf_file}")
-                return True, str(pdf_file)
-            return False, ""
-        except Exception as e:
-            logger.error(f"HTML转PDF失败: {e}")
-            return False, ""
-    
-    def _load_default_css(self) -> str:
-        """加载默认CSS样式（基于test_document_style.html）"""
-        return """
+# 默认CSS样式（各实例共用同一字符串对象，构造转换器时无需重新生成）
+_DEFAULT_CSS = """
         /* A4纸张规范样式 - 适合打印和PDF转换 */
         @page {
             size: A4;
@@ -590,461 +557,99 @@ class MarkdownToPdfConverter:
             }
         }
         """
-    
-    def _convert_md_to_html(self) -> str:
-        """将Markdown转换为HTML"""
-        if _markdown is None:
-            raise ImportError("缺少markdown包，无法将Markdown转换为HTML")
-        # 分割文档为三个部分：封面、目录、正文
-        cover_html = self._process_cover_section()
-        toc_html = self._process_toc_section()
-        content_html = self._process_content_section()
-        
-        # 提取标题
-        title = self._extract_title()
-        
-        # 生成完整HTML
-        html = f"""<!DOCTYPE html>
+
+# CSS 压缩：注释、多余空白；引号内文本原样保留，冒号前空格（可能是后代选择器）不动
+_RE_CSS_COMMENT = re.compile(r"/\*[\s\S]*?\*/")
+_RE_CSS_SPACE = re.compile(r'("[^"]*"|\'[^\']*\')|\s*([{};,>])\s*|(:)\s+|\s+')
+
+
+def _minify_css(css: str) -> str:
+    """去除注释并压缩空白，供内嵌或外部样式使用。"""
+    css = _RE_CSS_COMMENT.sub("", css)
+    return _RE_CSS_SPACE.sub(lambda m: m.group(1) or m.group(2) or m.group(3) or " ", css).strip()
+
+
+# 压缩后的默认样式（导入时计算一次），每份HTML与每次PDF渲染都少处理约一半的样式字节
+_DEFAULT_CSS_MIN = _minify_css(_DEFAULT_CSS)
+
+
+# 完整HTML文档的头部模板与结尾
+_HTML_HEAD_TMPL = """<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{title}</title>
     <style>
-        {self.css_style}
+        {css}
     </style>
 </head>
 <body>
-{cover_html}
-{toc_html}
-{content_html}
-</body>
-</html>"""
-        
-        return html
-
-    def _make_html_editable(self, html: str) -> str:
-        """对HTML注入可编辑控件：建议表格、综合结论、工具条与打印样式"""
-        try:
-            # 注入工具条与样式（插入到</head>前与<body>开始处）
-            style_block = self._editor_style_block()
-            script_block = self._editor_script_block()
-
-            # 注入报告元数据（用于文件命名）
-            meta_base = f'<meta name="x-report-base" content="{self.output_name}">'
-
-            if '</head>' in html:
-                html = html.replace('</head>', f"{meta_base}\n{style_block}\n{script_block}\n</head>")
-            else:
-                html = f"<head>{meta_base}{style_block}{script_block}</head>\n{html}"
-
-            if '<body>' in html:
-                html = html.replace('<body>', '<body>\n' + self._editor_toolbar_block())
-            else:
-                html = '<body>' + self._editor_toolbar_block() + html
-
-            # 标记 1.2 建议表格（找到1.2标题后的第一张表）
-            html = self._mark_advice_table_editable(html)
-
-            # 标记 综合结论 占位（按章节锚点依次处理）
-            html = self._mark_conclusions_editable(html)
-            # 捕获页面上其余“综合结论：[…]”占位并统一为空的可编辑区域
-            html = self._mark_all_conclusion_placeholders(html)
-            # 规范结论区结构，避免 <p> 内嵌 <div>
-            html = self._normalize_conclusion_blocks(html)
-            # 标记“服务器类型二选一”单元格可编辑（下拉选择）
-            html = self._mark_server_type_editable(html)
+"""
+# 外部样式模式：样式写入输出目录的独立文件，页面以 <link> 引用
+_EXTERNAL_CSS_NAME = "_report.css"
+_HTML_HEAD_LINK_TMPL = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <link rel="stylesheet" href="{css_href}">
+</head>
+<body>
+"""
+_HTML_TAIL = "\n</body>\n</html>"
 
-            # 3.1 系统硬件配置表：保持默认样式（RAC不再做特殊列宽处理）
 
-            return html
-        except Exception as e:
-            logger.error(f"注入可编辑控件失败: {e}")
-            return html
-
-    def _mark_advice_table_editable(self, html: str) -> str:
-        """将1.2节后的第一张表格设为可编辑，并添加行管理按钮"""
-        try:
-            # 寻找1.2节标题
-            h2_pattern = re.compile(r"<h2[^>]*>\s*1\.2\.[\s\S]*?</h2>")
-            m = h2_pattern.search(html)
-            if not m:
-                return html
-            start = m.end()
-
-            # 找到其后的第一个<table>
-            table_start = html.find('<table', start)
-            if table_start == -1:
-                return html
-            table_end = html.find('</table>', table_start)
-            if table_end == -1:
-                return html
-            table_end += len('</table>')
-
-            table_html = html[table_start:table_end]
-
-            # 给<table>打标记 data-suggest-id，避免重复添加
-            if 'data-suggest-id="advice_table"' not in table_html:
-                table_html = re.sub(r'<table', '<table data-suggest-id="advice_table"', table_html, count=1)
-
-            # 为所有<td>增加contenteditable
-            def add_editable_td(match):
-                td_tag = match.group(0)
-                if 'contenteditable' in td_tag:
-                    return td_tag
-                return td_tag.replace('<td', '<td contenteditable="true"')
-
-            table_html = re.sub(r'<td(?![^>]*contenteditable)[^>]*>', add_editable_td, table_html)
-
-            # 在表格后添加行编辑按钮（编辑阶段显示，打印隐藏）
-            controls = (
-                '<div class="edit-controls" data-target="advice_table" aria-hidden="false">'
-                '<button type="button" onclick="window.__editor.addRow(\'advice_table\')">新增一行</button>'
-                '<button type="button" onclick="window.__editor.removeLastRow(\'advice_table\')">删除末行</button>'
-                '</div>'
-            )
-
-            html = html[:table_start] + table_html + controls + html[table_end:]
-            return html
-        except Exception as e:
-            logger.error(f"标记1.2建议表格失败: {e}")
-            return html
-
-    def _mark_conclusions_editable(self, html: str) -> str:
-        """将指定章节内的"综合结论：【…】"替换为可编辑表格"""
-        anchors = MarkdownConfig.HTML_SECTION_ANCHORS
-        for key, anchor in anchors.items():
-            if key == 'advice_table':
-                continue
-            try:
-                # 找到章节<h2>（例如 5.2. …）
-                h2_pattern = re.compile(rf"<h2[^>]*>\s*{re.escape(anchor)}[\s\S]*?</h2>")
-                m = h2_pattern.search(html)
-                if not m:
-                    continue
-                sec_start = m.end()
-                # 章节结束位置（下一个<h2>或文档结束）
-                next_h2 = html.find('<h2', sec_start)
-                sec_end = next_h2 if next_h2 != -1 else len(html)
-                segment = html[sec_start:sec_end]
-
-                # 查找"综合结论：【…】"
-                concl_re = re.compile(MarkdownConfig.CONCLUSION_PLACEHOLDER_PATTERN)
-                if not concl_re.search(segment):
-                    continue
-
-                def _repl(match):
-                    # 使用表格形式替换
-                    table_id = f"conclusion_table_{key}"
-                    return (
-                        f'<p><strong>综合结论：</strong></p>\n'
-                        f'<table data-suggest-id="{table_id}" class="conclusion-table">\n'
-                        f'<thead>\n'
-                        f'<tr><th style="width: 60px;">序号</th><th>结论内容</th></tr>\n'
-                        f'</thead>\n'
-                        f'<tbody>\n'
-                        f'<tr><td>1</td><td contenteditable="true"></td></tr>\n'
-                        f'</tbody>\n'
-                        f'</table>\n'
-                        f'<div class="edit-controls" data-target="{table_id}" aria-hidden="false">\n'
-                        f'<button type="button" onclick="window.__editor.addConclusionRow(\'{table_id}\')">新增结论</button>\n'
-                        f'<button type="button" onclick="window.__editor.removeConclusionRow(\'{table_id}\')">删除末行</button>\n'
-                        f'</div>'
-                    )
-
-                new_segment = concl_re.sub(_repl, segment, count=1)
-                html = html[:sec_start] + new_segment + html[sec_end:]
-            except Exception as e:
-                logger.error(f"标记章节{key}结论失败: {e}")
-                continue
-        return html
-
-    def _mark_all_conclusion_placeholders(self, html: str) -> str:
-        """将页面上所有剩余的"综合结论：【…】"替换为可编辑表格，自动编号ID。"""
-        try:
-            pattern = re.compile(MarkdownConfig.CONCLUSION_PLACEHOLDER_PATTERN)
-            auto_idx = 1
-
-            def repl(m: re.Match) -> str:
-                nonlocal auto_idx
-                table_id = f"conclusion_table_auto_{auto_idx}"
-                replacement = (
-                    f'<p><strong>综合结论：</strong></p>\n'
-                    f'<table data-suggest-id="{table_id}" class="conclusion-table">\n'
-                    f'<thead>\n'
-                    f'<tr><th style="width: 60px;">序号</th><th>结论内容</th></tr>\n'
-                    f'</thead>\n'
-                    f'<tbody>\n'
-                    f'<tr><td>1</td><td contenteditable="true"></td></tr>\n'
-                    f'</tbody>\n'
-                    f'</table>\n'
-                    f'<div class="edit-controls" data-target="{table_id}" aria-hidden="false">\n'
-                    f'<button type="button" onclick="window.__editor.addConclusionRow(\'{table_id}\')">新增结论</button>\n'
-                    f'<button type="button" onclick="window.__editor.removeConclusionRow(\'{table_id}\')">删除末行</button>\n'
-                    f'</div>'
-                )
-                auto_idx += 1
-                return replacement
-
-            # 为避免替换已经处理过的段落，这里先跳过包含 contenteditable 的片段
-            # 简单做法：全局替换，随后移除重复：若在已含contenteditable的上下文内，不会出现原始占位文本
-            return pattern.sub(repl, html)
-        except Exception as e:
-            logger.warning(f"替换通用结论占位失败: {e}")
-            return html
-
-    def _normalize_conclusion_blocks(self, html: str) -> str:
-        """修复 <p> 内嵌 <div class="editable-conclusion"> 的结构为分离的块级元素
-
-        转换：
-          <p>综合结论：<div class="editable-conclusion" ...></div></p>
-        为：
-          <p><strong>综合结论：</strong></p><div class="editable-conclusion" ...></div>
-        """
-        try:
-            # 基础情形：<p>综合结论：<div class="editable-conclusion">...</div></p>
-            html = re.sub(
-                r"<p>\s*综合结论：\s*(<div class=\"editable-conclusion\"[\s\S]*?</div>)\s*</p>",
-                r"<p><strong>综合结论：</strong></p>\1",
-                html
-            )
-            # 可选情形：<p><strong>综合结论：</strong><div ...></div></p>
-            html = re.sub(
-                r"<p>\s*<strong>综合结论：</strong>\s*(<div class=\"editable-conclusion\"[\s\S]*?</div>)\s*</p>",
-                r"<p><strong>综合结论：</strong></p>\1",
-                html
-            )
-            # 清理多余的空段落
-            html = re.sub(r"<p>\s*</p>", "", html)
-            return html
-        except Exception as e:
-            logger.debug(f"规范结论块结构失败: {e}")
-            return html
-
-    def _editor_style_block(self) -> str:
-        """返回编辑模式所需样式，打印时隐藏编辑UI"""
-        return """
-<style>
-/* 编辑标识与工具条样式 */
-[contenteditable="true"] { outline: 1px dashed #999; padding: 2px; font-size: 12pt; line-height: inherit; }
-
-/* 结论编辑区域特殊样式 */
-.editable-conclusion {
-    display: block;
-    width: 100%;
-    min-height: 1.2em;
-    margin-top: 0.3em;
-    padding: 6px 10px;
-    border: 1px dashed #4a90e2;
-    border-radius: 4px;
-    background: #f0f8ff;
-    font-size: 12pt;
-    line-height: 1.4;
-    white-space: pre-wrap;
-    word-wrap: break-word;
-    overflow-wrap: break-word;
-    box-sizing: border-box;
-}
-
-.editable-conclusion:empty:before {
-    content: attr(placeholder);
-    color: #9aa0a6;
-    font-style: italic;
-}
-
-.editable-conclusion:focus {
-    outline: none;
-    border-color: #4a90e2;
-    background: #ffffff;
-    box-shadow: 0 0 4px rgba(74, 144, 226, 0.3);
-}
-
-/* 最终态渲染（预览/导出） */
-.conclusion-output{
-    margin: .3em 0 .8em;
-    white-space: pre-wrap; /* 保留空格和换行 */
-    border: none; background: transparent; padding: 0;
-}
-.conclusion-output p{ margin: 0 0 .6em; text-indent: 2em; }
-.conclusion-output ul, .conclusion-output ol{ margin: .4em 0 .8em 2em; }
-
-#edit-toolbar { 
-    position: sticky; 
-    top: 0; 
-    background: #fff8dc; 
-    border-bottom: 1px solid #ddd; 
-    padding: 8px; 
-    z-index: 9999; 
-    font-size: 12px; 
-}
-#edit-toolbar button { margin-right: 8px; }
-
-/* 表格编辑样式保持不变 */
-table[data-suggest-id="advice_table"] [contenteditable="true"] {
-    outline: 1px dashed #999;
-    padding: 2px;
-}
-
-/* 结论表格样式 */
-.conclusion-table {
-    border-collapse: collapse;
-    width: 100%;
-    margin: 10px 0;
-}
-
-.conclusion-table th {
-    background-color: #f0f0f0;
-    border: 1px solid #ddd;
-    padding: 8px;
-    text-align: left;
-    font-weight: bold;
-}
-
-.conclusion-table td {
-    border: 1px solid #ddd;
-    padding: 8px;
-    vertical-align: top;
-}
-
-.conclusion-table td:first-child {
-    text-align: center;
-    font-weight: bold;
-    background-color: #f9f9f9;
-}
-
-.conclusion-table [contenteditable="true"] {
-    outline: 1px dashed #999;
-    padding: 4px;
-    min-height: 60px;
-    white-space: pre-wrap;
-}
-
-.edit-controls { margin: 6px 0 12px 0; }
-.edit-controls button { margin-right: 6px; }
-
-/* 行内选择字段（如服务器类型二选一） */
-.field-inline select { font-size: 12pt; padding: 2px 6px; }
-
-/* 预览覆盖层 */
-#preview-overlay {
-  position: fixed;
-  inset: 0;
-  background: rgba(0,0,0,0.45);
-  z-index: 10000;
-  display: none;
-}
-#preview-panel {
-  position: absolute;
-  left: 5%;
-  top: 5%;
-  width: 90%;
-  height: 90%;
-  background: #fff;
-  border: 1px solid #ccc;
-  box-shadow: 0 6px 18px rgba(0,0,0,0.2);
-  overflow: auto;
-  border-radius: 6px;
-}
-#preview-close {
-  position: sticky;
-  top: 0;
-  float: right;
-  margin: 8px;
-}
-#preview-content { padding: 16px 20px; max-width: 210mm; margin: 0 auto; font-size: 12pt; line-height: 1.5; }
-
-/* 打印隐藏编辑UI */
-@media print {
-  #edit-toolbar, .edit-controls { display: none !important; }
-  [contenteditable="true"] { outline: none !important; border: none !important; background: transparent !important; }
-  .editable-conclusion { border: none !important; background: transparent !important; padding: 0 !important; }
-  #preview-overlay { display: none !important; }
-}
-
-/* 编辑态压缩封面与目录留白（仅优化浏览器视图，不影响打印） */
-body[data-editing="true"] .cover-page {
-  min-height: auto !important;
-  justify-content: flex-start !important;
-  padding: 16px 20px !important;
-}
-body[data-editing="true"] .cover-page::before,
-body[data-editing="true"] .cover-page::after {
-  display: none !important;
-}
-body[data-editing="true"] .cover-page h1 {
-  margin: 12px 0 !important;
-}
-body[data-editing="true"] .cover-page h2 {
-  margin: 6px 0 16px !important;
-}
-body[data-editing="true"] .cover-info {
-  margin-top: 8px !important;
-  margin-bottom: 16px !important;
-}
-body[data-editing="true"] .toc-page {
-  padding: 16px !important;
-}
-
-/* 保持默认表格列宽，不对3.1章节做特殊样式 */
-</style>
-        """
-
-    def _editor_toolbar_block(self) -> str:
-        """顶部工具条（仅保留导出功能）"""
-        return """
-<div id="edit-toolbar" role="region" aria-label="编辑工具">
-  <strong>编辑模式：</strong>
-  <button type="button" onclick="window.__editor.previewFormatted()">预览格式化</button>
-  <button type="button" onclick="window.__editor.exportFinalHTML()">导出最终HTML</button>
-  <span style="margin-left: 16px; color: #666; font-size: 11px;">
-    提示：编辑完成后，请导出最终HTML，然后使用 htmltopdf 命令转换为PDF
-  </span>
-</div>
-        """
-
-    def _editor_script_block(self) -> str:
-        """注入编辑脚本：序列化/反序列化与导出纯净HTML（ES5兼容）"""
-        suffix = MarkdownConfig.SUGGESTIONS_JSON_SUFFIX
-        script = r"""
-<script>
-(function(){
-  function download(filename, text){
-    var a = document.createElement('a');
-    try {
-      var blob = new Blob([text], {type: 'text/plain'});
-      var url = (window.URL || window.webkitURL).createObjectURL(blob);
-      a.href = url; a.download = filename; a.click();
-      (window.URL || window.webkitURL).revokeObjectURL(url);
-    } catch(e){
-      a.setAttribute('href','data:text/plain;charset=utf-8,' + encodeURIComponent(text));
-      a.setAttribute('download', filename); a.click();
-    }
-  }
-  // 通用文本->HTML 格式化（段落/列表/换行），供预览与导出共享
-  function _escapeHtml(s){
-    return String(s).replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;');
-  }
-  function _formatUserTextToHtml(text){
-    if(!text) return '';
-    // 统一换行与空白
-    text = text.replace(/\r\n?/g,'\n').replace(/\t/g,' ');
-    // 标点规范（温和）
-    text = text.replace(/[，，]/g,'，').replace(/[。．]/g,'。').replace(/[；;]/g,'；').replace(/[：:]/g,'：');
-    // 若没有换行且文本较长，按句号/分号断行
-    if(text.indexOf('\n')===-1 && text.length>120){ text = text.replace(/([。；])\s*/g,'$1\n'); }
+# 可编辑HTML的编辑脚本（ES5兼容）；模块级常量只在导入时构造一次，
+# __SUG_SUFFIX__ 为建议JSON文件后缀占位
+_EDITOR_SCRIPT_TMPL = r"""
+<script>
+(function(){
+  // content 可为字符串或分段数组；分段直接交给 Blob 依次写入，不先拼成整串
+  function download(filename, content){
+    var a = document.createElement('a');
+    var parts = (typeof content === 'string') ? [content] : content;
+    try {
+      var blob = new Blob(parts, {type: 'text/plain'});
+      var url = (window.URL || window.webkitURL).createObjectURL(blob);
+      a.href = url; a.download = filename; a.click();
+      (window.URL || window.webkitURL).revokeObjectURL(url);
+    } catch(e){
+      a.setAttribute('href','data:text/plain;charset=utf-8,' + encodeURIComponent(parts.join('')));
+      a.setAttribute('download', filename); a.click();
+    }
+  }
+  // 通用文本->HTML 格式化（段落/列表/换行），供预览与导出共享；正则在闭包内只创建一次
+  var BULLET_RE = /^\s*[-*•·]\s+/, NUM_RE = /^\s*\d+[\.)、]\s+/;
+  var ESC_RE = /[&<>]/g, ESC_MAP = {'&':'&amp;', '<':'&lt;', '>':'&gt;'};
+  function _escRepl(c){ return ESC_MAP[c]; }
+  function _escapeHtml(s){
+    return String(s).replace(ESC_RE, _escRepl);
+  }
+  // 标点规范（温和）：单次扫描查表替换；原先的 [，，]→，等映射为恒等，只需处理需要改写的字符
+  var PUNCT_MAP = {'．':'。', ';':'；', ':':'：'};
+  function _punctRepl(c){ return PUNCT_MAP[c]; }
+  function _wsRepl(m){ return m === '\t' ? ' ' : '\n'; }
+  function _formatUserTextToHtml(text){
+    if(!text) return '';
+    // 统一换行与空白（一次扫描）
+    text = text.replace(/\r\n?|\t/g, _wsRepl);
+    // 标点规范（温和）
+    text = text.replace(/[．;:]/g, _punctRepl);
+    // 若没有换行且文本较长，按句号/分号断行
+    if(text.indexOf('\n')===-1 && text.length>120){ text = text.replace(/([。；])\s*/g,'$1\n'); }
 
     var lines = text.split('\n');
     var html = [];
     var listMode = null; // 'ul' | 'ol'
-    var bulletRe = /^\s*[-*•·]\s+/;
-    var numRe    = /^\s*\d+[\.)、]\s+/;
     function flushList(items){ if(!items||!items.length) return; var tag=(listMode==='ol')?'ol':'ul'; html.push('<'+tag+'>'); for(var i=0;i<items.length;i++){ html.push('<li>'+_escapeHtml(items[i])+'</li>'); } html.push('</'+tag+'>'); }
     var items=[];
     for(var i=0;i<lines.length;i++){
       var line = lines[i].replace(/\s+$/,'');
       if(!line){ if(listMode){ flushList(items); items=[]; listMode=null; } continue; }
-      if(bulletRe.test(line)){ if(listMode && listMode!=='ul'){ flushList(items); items=[]; } listMode='ul'; items.push(line.replace(bulletRe,'')); continue; }
-      if(numRe.test(line)){ if(listMode && listMode!=='ol'){ flushList(items); items=[]; } listMode='ol'; items.push(line.replace(numRe,'')); continue; }
+      if(BULLET_RE.test(line)){ if(listMode && listMode!=='ul'){ flushList(items); items=[]; } listMode='ul'; items.push(line.replace(BULLET_RE,'')); continue; }
+      if(NUM_RE.test(line)){ if(listMode && listMode!=='ol'){ flushList(items); items=[]; } listMode='ol'; items.push(line.replace(NUM_RE,'')); continue; }
       if(listMode){ flushList(items); items=[]; listMode=null; }
       // 将每一行视为一个段落，保证每次回车都形成独立段落
       // 保留连续空格，使用 &nbsp; 替换普通空格
@@ -1056,10 +661,25 @@ body[data-editing="true"] .toc-page {
     if(listMode){ flushList(items); }
     return html.join('');
   }
+  // 去掉编辑标记类；body 原本没有其他类时连同空的 class 属性一起移除
+  function clearEditingClass(body){
+    body.classList.remove('editing');
+    if(!body.classList.length){ body.removeAttribute('class'); }
+  }
+  // 单类名/ID 查找用 getElementsByClassName/getElementById，比 querySelectorAll 解析选择器快得多；
+  // 复合选择器（属性匹配等）仍用 querySelectorAll
+  function getAdviceTable(){
+    // 旧版HTML的建议表格没有 id，回退到属性选择器
+    return document.getElementById('advice-table') || document.querySelector('table[data-suggest-id="advice_table"]');
+  }
+  // 表格行与单元格直接走 tBodies/rows/cells 索引集合，不做选择器查询；
+  // 生成的表格表头都在 <thead>，isHeaderRow 只为没有 <tbody> 时回退到整表行保留
+  function bodyOf(table){ return table.tBodies[0] || table; }
+  function isHeaderRow(tr){ var cs=tr.cells; for(var i=0;i<cs.length;i++){ if(cs[i].tagName==='TH'){ return true; } } return false; }
   // 将编辑态的结论块转为最终态（预览/导出共用）
   function finalizeConclusions(root){
-    // 处理旧版结论块（兼容）
-    var nodes = root.querySelectorAll('.editable-conclusion');
+    // 处理旧版结论块（兼容）；循环内会改类名，先转成静态数组再遍历实时集合
+    var nodes = Array.prototype.slice.call(root.getElementsByClassName('editable-conclusion'));
     for(var i=0;i<nodes.length;i++){
       var el=nodes[i];
       var text = el.innerText || el.textContent || '';
@@ -1086,27 +706,30 @@ body[data-editing="true"] .toc-page {
       }
     }
   }
-  function collectData(){
-    var data = {};
-    // 收集所有可编辑结论（旧版兼容）
-    var conclusions = document.querySelectorAll('.editable-conclusion[data-suggest-id]');
+  // 收集编辑数据；传入 keys（id 集合）与上次结果 into 时只重新采集这些 id，
+  // 其余沿用 into 中的值（innerText 会触发排版，只读被编辑的区域）
+  function collectData(keys, into){
+    var data = into || {};
+    function want(id){ return !keys || keys.hasOwnProperty(id); }
+    // 收集所有可编辑结论（旧版兼容）；无 data-suggest-id 的由 if(id) 跳过
+    var conclusions = document.getElementsByClassName('editable-conclusion');
     for(var k=0;k<conclusions.length;k++){
       var el = conclusions[k]; 
       var id = el.getAttribute('data-suggest-id');
-      if(id){ data[id] = el.innerText || ''; }
+      if(id && want(id)){ data[id] = el.innerText || ''; }
     }
     // 服务器类型选择
     var st = document.querySelector('[data-suggest-id="server_type"] select');
     if(st){ data['server_type'] = st.value || ''; }
     // 收集建议表格数据
-    var table = document.querySelector('table[data-suggest-id="advice_table"]');
-    if(table){
-      var rows = []; var tbody = table.querySelector('tbody') || table;
-      var trList = tbody.querySelectorAll('tr');
+    var table = getAdviceTable();
+    if(table && want('advice_table')){
+      var rows = []; var tbody = bodyOf(table);
+      var trList = tbody.rows;
       for(var r=0;r<trList.length;r++){
         var tr = trList[r];
-        if(tr.querySelectorAll('th').length>0) continue;
-        var cells = []; var tds = tr.querySelectorAll('td');
+        if(isHeaderRow(tr)) continue;
+        var cells = []; var tds = tr.cells;
         for(var c=0;c<tds.length;c++){ cells.push(tds[c].innerText || ''); }
         if(cells.length) rows.push(cells);
       }
@@ -1117,24 +740,34 @@ body[data-editing="true"] .toc-page {
     for(var t=0;t<conclusionTables.length;t++){
       var ctable = conclusionTables[t];
       var tid = ctable.getAttribute('data-suggest-id');
-      if(!tid) continue;
-      var crows = []; var ctbody = ctable.querySelector('tbody') || ctable;
-      var ctrList = ctbody.querySelectorAll('tr');
+      if(!tid || !want(tid)) continue;
+      var crows = []; var ctbody = bodyOf(ctable);
+      var ctrList = ctbody.rows;
       for(var cr=0;cr<ctrList.length;cr++){
         var ctr = ctrList[cr];
-        var ctds = ctr.querySelectorAll('td');
+        var ctds = ctr.cells;
         if(ctds.length>=2){ crows.push(ctds[1].innerText || ''); }
       }
       data[tid] = crows;
     }
     return data;
   }
+  // 可编辑单元格模板：新行的 <td> 由模板浅拷贝得到，不再逐个 setAttribute
+  var EDITABLE_TD = document.createElement('td');
+  EDITABLE_TD.setAttribute('contenteditable','true');
   function applyData(data){
-    // 应用结论数据（旧版兼容）
+    markAllDirty();
+    // 应用结论数据（旧版兼容）：一次遍历建立 id->元素 映射（同 id 取文档中第一个）
+    var byId = {};
+    var conclusions = document.getElementsByClassName('editable-conclusion');
+    for(var k=0;k<conclusions.length;k++){
+      var cid = conclusions[k].getAttribute('data-suggest-id');
+      if(cid !== null && !byId.hasOwnProperty(cid)){ byId[cid] = conclusions[k]; }
+    }
     for(var key in data){ 
       if(!data.hasOwnProperty(key)) continue; 
       if(key==='advice_table' || key.indexOf('conclusion_table_')===0) continue;
-      var conclusion = document.querySelector('.editable-conclusion[data-suggest-id="'+key+'"]'); 
+      var conclusion = byId.hasOwnProperty(key) ? byId[key] : null; 
       if(conclusion){ conclusion.innerText = data[key] || ''; }
     }
     // 应用服务器类型选择
@@ -1144,15 +777,17 @@ body[data-editing="true"] .toc-page {
     }
     // 应用建议表格数据
     if(Object.prototype.toString.call(data['advice_table'])==='[object Array]'){
-      var table = document.querySelector('table[data-suggest-id="advice_table"]');
-      if(table){ var tbody = table.querySelector('tbody') || table;
-        var trs = tbody.querySelectorAll('tr');
-        for(var i=trs.length-1;i>=0;i--){ if(trs[i].querySelectorAll('th').length===0){ tbody.removeChild(trs[i]); } }
-        var rows = data['advice_table'] || [];
+      var table = getAdviceTable();
+      if(table){ var tbody = bodyOf(table);
+        var trs = tbody.rows;
+        for(var i=trs.length-1;i>=0;i--){ if(!isHeaderRow(trs[i])){ trs[i].parentNode.removeChild(trs[i]); } }
+        // 新行先放入文档片段，最后一次性插入，避免逐行触发重排
+        var rows = data['advice_table'] || []; var frag = document.createDocumentFragment();
         for(var r=0;r<rows.length;r++){ var tr = document.createElement('tr'); var cols = rows[r];
-          for(var c=0;c<cols.length;c++){ var td = document.createElement('td'); td.setAttribute('contenteditable','true'); td.innerText = cols[c]; tr.appendChild(td);}
-          tbody.appendChild(tr);
+          for(var c=0;c<cols.length;c++){ var td = EDITABLE_TD.cloneNode(false); td.innerText = cols[c]; tr.appendChild(td);}
+          frag.appendChild(tr);
         }
+        tbody.appendChild(frag);
       }
     }
     // 应用结论表格数据
@@ -1160,22 +795,22 @@ body[data-editing="true"] .toc-page {
       if(!data.hasOwnProperty(tkey) || tkey.indexOf('conclusion_table_')!==0) continue;
       var ctable = document.querySelector('table[data-suggest-id="'+tkey+'"]');
       if(!ctable) continue;
-      var ctbody = ctable.querySelector('tbody') || ctable;
+      var ctbody = bodyOf(ctable);
       // 清空现有行
       while(ctbody.firstChild){ ctbody.removeChild(ctbody.firstChild); }
-      // 添加新行
-      var crows = data[tkey] || [];
+      // 添加新行（经文档片段一次插入）
+      var crows = data[tkey] || []; var cfrag = document.createDocumentFragment();
       for(var cr=0;cr<crows.length;cr++){
         var ctr = document.createElement('tr');
         var ctd1 = document.createElement('td');
         ctd1.textContent = (cr+1);
         ctr.appendChild(ctd1);
-        var ctd2 = document.createElement('td');
-        ctd2.setAttribute('contenteditable','true');
+        var ctd2 = EDITABLE_TD.cloneNode(false);
         ctd2.innerText = crows[cr] || '';
         ctr.appendChild(ctd2);
-        ctbody.appendChild(ctr);
+        cfrag.appendChild(ctr);
       }
+      ctbody.appendChild(cfrag);
     }
   }
   function saveJSON(){ var data = collectData(); var meta=document.querySelector('meta[name="x-report-base"]'); var base=(meta&&meta.content)||'report'; var name = base + '__SUG_SUFFIX__'; download(name, JSON.stringify(data,null,2)); }
@@ -1194,12 +829,13 @@ body[data-editing="true"] .toc-page {
         if(sel){ var v = sel.value || ((sel.options[sel.selectedIndex]||{}).text)||''; wraps[i].setAttribute('data-selected-value', v); }
       }
     })();
-    var doc=document.cloneNode(true);
+    // 只深拷贝 body 元素：导出流程不改动 head，其中的样式与脚本直接从当前文档序列化
+    var bodyClone=document.body.cloneNode(true);
     // 统一将结论区从编辑态转为最终态
-    finalizeConclusions(doc);
+    finalizeConclusions(bodyClone);
     // 将“服务器类型二选一”转为纯文本
     (function(){
-      var wraps = doc.querySelectorAll('[data-suggest-id="server_type"]');
+      var wraps = bodyClone.querySelectorAll('[data-suggest-id="server_type"]');
       for(var i=0;i<wraps.length;i++){
         var wrap = wraps[i];
         var val = wrap.getAttribute('data-selected-value') || '';
@@ -1208,15 +844,35 @@ body[data-editing="true"] .toc-page {
         td.innerHTML = val || '';
       }
     })();
-    var rm = doc.querySelectorAll('#edit-toolbar, .edit-controls'); for(var i=0;i<rm.length;i++){ rm[i].parentNode.removeChild(rm[i]); }
-    var ed1 = doc.querySelectorAll('[contenteditable]'); for(var j=0;j< ed1.length;j++){ ed1[j].removeAttribute('contenteditable'); }
-    var ed2 = doc.querySelectorAll('[data-suggest-id]'); for(var k=0;k< ed2.length;k++){ ed2[k].removeAttribute('data-suggest-id'); }
-    // 清理编辑相关类
-    var cls = doc.querySelectorAll('.editable-conclusion, .editable-output, .field-inline, .field-input');
-    for(var m=0;m<cls.length;m++){ if(cls[m].classList.contains('editable-conclusion')){ cls[m].className='conclusion-output'; } else { cls[m].removeAttribute('class'); } }
+    // 一次查询取出全部编辑痕迹（联合选择器只遍历一次DOM），再按元素分别处理：
+    // 工具条/行编辑按钮整体移除，其余去掉可编辑属性并清理编辑相关类
+    var els = bodyClone.querySelectorAll('#edit-toolbar,.edit-controls,[contenteditable],[data-suggest-id],.editable-conclusion,.editable-output,.field-inline,.field-input');
+    for(var i=0;i<els.length;i++){
+      var el = els[i]; var cl = el.classList;
+      if(el.id==='edit-toolbar' || cl.contains('edit-controls')){ if(el.parentNode){ el.parentNode.removeChild(el); } continue; }
+      el.removeAttribute('contenteditable');
+      el.removeAttribute('data-suggest-id');
+      if(cl.contains('editable-conclusion')){ el.className='conclusion-output'; }
+      else if(cl.contains('editable-output') || cl.contains('field-inline') || cl.contains('field-input')){ el.removeAttribute('class'); }
+    }
     // 移除编辑标记
-    if(doc.body){ doc.body.removeAttribute('data-editing'); }
-    var html='<!DOCTYPE html>\n' + doc.documentElement.outerHTML; download(base + '.final.html', html); }
+    clearEditingClass(bodyClone);
+    download(base + '.final.html', documentPartsWithBody(bodyClone)); }
+  // 按节点分段序列化整页，但以 bodyClone 代替当前 body 元素；html 起始标签、head 及其间空白/注释按原样输出。
+  // 返回分段数组供 Blob 直接拼接，整页HTML不会先物化为单个字符串
+  function documentPartsWithBody(bodyClone){
+    var root = document.documentElement;
+    var shell = root.cloneNode(false).outerHTML;
+    var out = ['<!DOCTYPE html>\n', shell.substring(0, shell.length - '</html>'.length)];
+    for(var n=root.firstChild; n; n=n.nextSibling){
+      if(n === document.body){ out.push(bodyClone.outerHTML); }
+      else if(n.nodeType === 1){ out.push(n.outerHTML); }
+      else if(n.nodeType === 3){ out.push(_escapeHtml(n.data).replace(/\u00a0/g, '&nbsp;')); }
+      else if(n.nodeType === 8){ out.push('<!--' + n.data + '-->'); }
+    }
+    out.push('</html>');
+    return out;
+  }
   function ensurePreviewOverlay(){
     var ov = document.getElementById('preview-overlay');
     if(!ov){
@@ -1233,6 +889,11 @@ body[data-editing="true"] .toc-page {
     return ov;
   }
   function previewFormatted(){
+    if(!previewDirty && previewHtml !== null && document.getElementById('preview-overlay')){
+      // 自上次预览以来没有编辑：内容区仍是上次结果，省去整页深拷贝与格式化
+      ensurePreviewOverlay().style.display = 'block';
+      return;
+    }
     // 克隆并格式化内容
     // 预先捕获服务器类型选择值到data-selected-value，确保clone后可读取
     (function(){
@@ -1244,13 +905,10 @@ body[data-editing="true"] .toc-page {
     })();
     var bodyClone = document.body.cloneNode(true);
     // 移除编辑标记（预览应显示打印样式）
-    if(bodyClone){ bodyClone.removeAttribute('data-editing'); }
-    // 移除预览自身、工具与编辑控件
-    var removeSelectors = ['#preview-overlay', '#edit-toolbar', '.edit-controls'];
-    for(var i=0;i<removeSelectors.length;i++){
-      var nodes = bodyClone.querySelectorAll(removeSelectors[i]);
-      for(var j=0;j<nodes.length;j++){ nodes[j].parentNode.removeChild(nodes[j]); }
-    }
+    if(bodyClone){ clearEditingClass(bodyClone); }
+    // 移除预览自身、工具与编辑控件（联合选择器一次查询）
+    var nodes = bodyClone.querySelectorAll('#preview-overlay,#edit-toolbar,.edit-controls');
+    for(var j=0;j<nodes.length;j++){ if(nodes[j].parentNode){ nodes[j].parentNode.removeChild(nodes[j]); } }
     // 统一将结论区从编辑态转为最终态
     finalizeConclusions(bodyClone);
     // 预览中同步将服务器类型选择转为纯文本展示
@@ -1266,42 +924,54 @@ body[data-editing="true"] .toc-page {
     })();
     var ov = ensurePreviewOverlay();
     var box = ov.querySelector('#preview-content');
-    box.innerHTML = bodyClone.innerHTML;
+    previewHtml = bodyClone.innerHTML;
+    previewDirty = false;
+    box.innerHTML = previewHtml;
     ov.style.display = 'block';
   }
-  function addRow(targetId){ var table=document.querySelector('table[data-suggest-id="'+targetId+'"]'); if(!table) return; var tbody=table.querySelector('tbody')||table;
-    var lastRow=tbody.querySelector('tr'); var cols= lastRow? lastRow.querySelectorAll('td').length : 4; var tr=document.createElement('tr');
-    for(var i=0;i<cols;i++){ var td=document.createElement('td'); td.setAttribute('contenteditable','true'); tr.appendChild(td);} tbody.appendChild(tr); }
-  function removeLastRow(targetId){ var table=document.querySelector('table[data-suggest-id="'+targetId+'"]'); if(!table) return; var tbody=table.querySelector('tbody')||table;
-    var rows=[]; var trs=tbody.querySelectorAll('tr'); for(var i=0;i<trs.length;i++){ if(trs[i].querySelectorAll('th').length===0){ rows.push(trs[i]); } } if(rows.length>0){ rows[rows.length-1].parentNode.removeChild(rows[rows.length-1]); } }
+  function addRow(targetId){ markAllDirty(); var table=document.querySelector('table[data-suggest-id="'+targetId+'"]'); if(!table) return; var tbody=bodyOf(table);
+    var lastRow=tbody.rows[0]; var cols= lastRow? lastRow.cells.length : 4; var tr=document.createElement('tr');
+    for(var i=0;i<cols;i++){ tr.appendChild(EDITABLE_TD.cloneNode(false)); } tbody.appendChild(tr); }
+  function removeLastRow(targetId){ markAllDirty(); var table=document.querySelector('table[data-suggest-id="'+targetId+'"]'); if(!table) return; var tbody=bodyOf(table);
+    var trs=tbody.rows; for(var i=trs.length-1;i>=0;i--){ if(!isHeaderRow(trs[i])){ trs[i].parentNode.removeChild(trs[i]); break; } } }
   function addConclusionRow(targetId){ 
+    markAllDirty();
     var table=document.querySelector('table[data-suggest-id="'+targetId+'"]'); 
     if(!table) return; 
-    var tbody=table.querySelector('tbody')||table;
-    var rows = tbody.querySelectorAll('tr');
-    var nextNum = rows.length + 1;
+    var tbody=bodyOf(table);
+    var nextNum = tbody.rows.length + 1;
     var tr=document.createElement('tr');
     var td1=document.createElement('td'); 
     td1.textContent = nextNum; 
     tr.appendChild(td1);
-    var td2=document.createElement('td'); 
-    td2.setAttribute('contenteditable','true'); 
-    tr.appendChild(td2);
+    tr.appendChild(EDITABLE_TD.cloneNode(false));
     tbody.appendChild(tr); 
   }
   function removeConclusionRow(targetId){ 
+    markAllDirty();
     var table=document.querySelector('table[data-suggest-id="'+targetId+'"]'); 
     if(!table) return; 
-    var tbody=table.querySelector('tbody')||table;
-    var rows=tbody.querySelectorAll('tr'); 
+    var rows=bodyOf(table).rows;
     if(rows.length>1){ 
       rows[rows.length-1].parentNode.removeChild(rows[rows.length-1]); 
     } 
   }
-  function autoSave(){ try{ var data=collectData(); localStorage.setItem('report_edits', JSON.stringify(data)); }catch(e){} }
+  // 自动保存：输入去抖 300ms；只重新采集输入所在的 data-suggest-id 区域，
+  // 增删行/载入数据等结构变化后置 allDirty，下次保存全量采集
+  var saveTimer = null; var lastData = null; var dirtyIds = {}; var allDirty = true;
+  // 预览缓存：文档未改动时再次预览直接显示上次结果（输入/选择变化与结构变化时失效）
+  var previewHtml = null; var previewDirty = true;
+  function markAllDirty(){ allDirty = true; previewDirty = true; }
+  function autoSave(){ try{
+      var data = (allDirty || !lastData) ? collectData() : collectData(dirtyIds, lastData);
+      allDirty = false; dirtyIds = {}; lastData = data;
+      localStorage.setItem('report_edits', JSON.stringify(data)); }catch(e){} }
+  function scheduleSave(){ if(saveTimer) return; saveTimer = setTimeout(function(){ saveTimer = null; autoSave(); }, 300); }
+  // 关闭页面前补写尚未落盘的输入
+  window.addEventListener('pagehide', function(){ if(saveTimer){ clearTimeout(saveTimer); saveTimer = null; autoSave(); } });
   // 结论输入增强：规范粘贴为纯文本并保留换行、回车插入<br>
   function attachConclusionHandlers(){
-    var nodes = document.querySelectorAll('.editable-conclusion');
+    var nodes = document.getElementsByClassName('editable-conclusion');
     for(var i=0;i<nodes.length;i++){
       var el = nodes[i];
       if(el.__handlersInstalled) continue;
@@ -1318,9 +988,7 @@ body[data-editing="true"] .toc-page {
           // 压缩多余空行但保留用户段落
           text = text.replace(/\n{3,}/g,'\n\n');
           // 安全转义并插入<br>
-          var html = text.split('\n').map(function(l){
-            return l.replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;');
-          }).join('<br>');
+          var html = text.split('\n').map(_escapeHtml).join('<br>');
           document.execCommand('insertHTML', false, html);
         }catch(err){}
       });
@@ -1332,40 +1000,679 @@ body[data-editing="true"] .toc-page {
   }
   // 结论实时输入不做强制格式化，避免破坏用户的段落与换行
   
+  // 任一输入或选择变化都使预览缓存失效
+  document.addEventListener('change', function(){ previewDirty = true; });
   document.addEventListener('input', function(ev){
+    previewDirty = true;
     var t=ev.target; 
     var ce=(t&&t.getAttribute&&t.getAttribute('contenteditable')==='true');
     var inTable=false; 
     var isConclusion = false;
     
     try{ 
-      inTable=!!(t&&t.closest&&t.closest('table[data-suggest-id="advice_table"]')); 
+      inTable=!!(t&&adviceTable&&adviceTable.contains(t)); 
       isConclusion=!!(t&&t.classList&&t.classList.contains('editable-conclusion'));
     }catch(e){}
     
-    // 结论输入：不改变用户输入，仅自动保存
+    // 结论输入：不改变用户输入，仅自动保存
+    
+    if(ce||inTable){
+      // 输入所在元素及其祖先上的 data-suggest-id 均需重新采集
+      for(var n=t; n && n.getAttribute; n=n.parentNode){ var sid=n.getAttribute('data-suggest-id'); if(sid){ dirtyIds[sid]=true; } }
+      scheduleSave();
+    }
+  });
+  // 建议表格元素：页面加载后定位一次，输入事件中用 contains 判断，不再逐个祖先匹配属性选择器
+  var adviceTable = null;
+  // 页面加载后绑定增强处理并设置编辑标记
+  function initEditor(){
+    adviceTable = getAdviceTable();
+    attachConclusionHandlers();
+    // 设置编辑标记以启用编辑态样式压缩
+    if(document.body){
+      document.body.classList.add('editing');
+    }
+  }
+  if(document.readyState === 'loading'){
+    document.addEventListener('DOMContentLoaded', initEditor);
+  } else {
+    initEditor();
+  }
+  try{ var cached=localStorage.getItem('report_edits'); if(cached){ applyData(JSON.parse(cached)); } }catch(e){}
+  window.__editor = { saveJSON: saveJSON, loadJSON: loadJSON, exportFinalHTML: exportFinalHTML, previewFormatted: previewFormatted, addRow: addRow, removeLastRow: removeLastRow, addConclusionRow: addConclusionRow, removeConclusionRow: removeConclusionRow };
+})();
+</script>
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _editor_script(suffix: str) -> str:
+    """按建议JSON后缀特化编辑脚本；后缀为配置常量，同一进程内只替换一次。"""
+    return _EDITOR_SCRIPT_TMPL.replace('__SUG_SUFFIX__', suffix)
+
+
+class MarkdownToPdfConverter:
+    """Markdown转PDF转换器最终版"""
+    
+    def __init__(self, external_css: bool = False, minify_css: bool = True):
+        """初始化转换器
+
+        Args:
+            external_css: 为 True 时样式写入输出目录的 _report.css 并以 <link> 引用，
+                批量生成时各HTML不再重复内嵌整份样式；默认内联，生成可单独分发的HTML。
+            minify_css: 默认使用压缩后的样式；调试样式时传 False 输出带注释与缩进的原始版本。
+        """
+        self.css_style = _DEFAULT_CSS_MIN if minify_css else _DEFAULT_CSS
+        self.external_css = external_css
+        self.md_content = ""
+        self.html_content = ""
+        self.md_file_path = None
+        self.output_dir = None
+        self.output_name = None
+        # (md_content, 标题)：按文档内容对象缓存 _extract_title 的结果
+        self._title_cache = None
+        # (md_content, 行列表)：封面/目录/正文处理共用一次切分
+        self._md_lines_cache = None
+        
+    def convert(self, md_file: str, output_dir: str, output_name: str) -> Tuple[bool, str, str]:
+        """
+        执行完整的转换流程
+        
+        Args:
+            md_file: Markdown文件路径
+            output_dir: 输出目录路径  
+            output_name: 输出文件名（不含扩展名）
+            
+        Returns:
+            (成功标志, HTML文件路径, PDF文件路径)
+        """
+        try:
+            # 参数验证
+            md_path = Path(md_file)
+            if not md_path.exists():
+                logger.error(f"Markdown文件不存在: {md_file}")
+                return False, "", ""
+                
+            out_path = Path(output_dir)
+            out_path.mkdir(parents=True, exist_ok=True)
+            if self.external_css:
+                self._write_external_css(out_path)
+            
+            self.output_name = output_name
+            
+            # 转换为HTML（需要markdown包）
+            logger.info(f"读取Markdown文件: {md_file}")
+            if _import_markdown() is None:
+                logger.error("缺少依赖包: markdown。请安装后重试: pip install markdown")
+                return False, "", ""
+            logger.info("开始转换Markdown到HTML")
+            self.prepare(md_path, out_path)
+            
+            # 保存HTML文件
+            html_file = out_path / f"{output_name}.html"
+            logger.info(f"保存HTML文件: {html_file}")
+            html_file.write_text(self.html_content, encoding='utf-8')
+            
+            # 转换为PDF
+            pdf_file = out_path / f"{output_name}.pdf"
+            logger.info(f"生成PDF文件: {pdf_file}")
+            success = self._convert_html_to_pdf(str(html_file), str(pdf_file))
+            
+            if success:
+                logger.success(f"转换完成 - HTML: {html_file}, PDF: {pdf_file}")
+                return True, str(html_file), str(pdf_file)
+            else:
+                logger.error("PDF生成失败")
+                return False, str(html_file), ""
+                
+        except Exception as e:
+            logger.error(f"转换过程出错: {e}")
+            return False, "", ""
+
+    def prepare(self, md_file: str, output_dir: str) -> str:
+        """读取Markdown并生成基础HTML（convert 与 generate_editable_html 共用）
+
+        结果写入 md_file_path / output_dir / md_content / html_content；
+        同一文档与输出目录再次调用时复用已渲染结果，文件变化后重新渲染。
+
+        Returns:
+            基础HTML（未注入编辑控件）
+        """
+        self.md_file_path = Path(md_file)
+        self.output_dir = Path(output_dir)
+        self.html_content = self._render_base_html(self.md_file_path)
+        return self.html_content
+
+    def generate_editable_html(self, md_file: str, output_dir: str, output_name: str) -> Tuple[bool, str]:
+        """生成可编辑版HTML文件
+
+        Args:
+            md_file: Markdown文件路径
+            output_dir: 输出目录
+            output_name: 输出文件名（不含扩展名）
+
+        Returns:
+            (成功标志, 可编辑HTML路径)
+        """
+        try:
+            md_path = Path(md_file)
+            if not md_path.exists():
+                logger.error(f"Markdown文件不存在: {md_file}")
+                return False, ""
+
+            out_path = Path(output_dir)
+            out_path.mkdir(parents=True, exist_ok=True)
+            if self.external_css:
+                self._write_external_css(out_path)
+
+            # 读取Markdown并转基础HTML
+            self.output_name = output_name
+
+            if _import_markdown() is None:
+                logger.error("缺少依赖包: markdown。请安装后重试: pip install markdown")
+                return False, ""
+            base_html = self.prepare(md_path, out_path)
+
+            # 注入可编辑控件、工具条、打印样式
+            editable_html = self._make_html_editable(base_html)
+
+            # 写入可编辑HTML
+            editable_name = f"{output_name}{MarkdownConfig.EDITABLE_HTML_SUFFIX}"
+            editable_file = out_path / editable_name
+            editable_file.write_text(editable_html, encoding='utf-8')
+
+            logger.info(f"可编辑HTML文件已生成: {editable_file}")
+            return True, str(editable_file)
+        except Exception as e:
+            logger.error(f"生成可编辑HTML失败: {e}")
+            return False, ""
+
+    def html_to_pdf(self, html_file: str, output_dir: str, output_name: str) -> Tuple[bool, str]:
+        """将现有HTML转换为PDF（用于htmltopdf子命令）
+
+        注意：HTML自身应包含打印样式（隐藏编辑UI、保留版式）。
+
+        Returns:
+            (成功标志, PDF路径)
+        """
+        try:
+            html_path = Path(html_file)
+            if not html_path.exists():
+                logger.error(f"HTML文件不存在: {html_file}")
+                return False, ""
+
+            out_path = Path(output_dir)
+            out_path.mkdir(parents=True, exist_ok=True)
+
+            pdf_file = out_path / f"{output_name}.pdf"
+
+            # 自动查找与HTML同目录的建议JSON（<base>.suggestions.json 或 <base>.editable.suggestions.json）
+            suggestions = None
+            base = html_path.name
+            base_no_ext = base[:-len(html_path.suffix)] if html_path.suffix else base
+            # 规范化基名：去除 .editable；保留 .final（如已为最终版）
+            if base_no_ext.endswith('.editable'):
+                base_core = base_no_ext[:-len('.editable')]
+            else:
+                base_core = base_no_ext
+
+            # 读取建议JSON：优先 <core>.suggestions.json；若输入是final且未找到，回退到去掉.final的建议文件
+            sug_candidates = [f"{base_core}{MarkdownConfig.SUGGESTIONS_JSON_SUFFIX}"]
+            if base_core.endswith('.final'):
+                sug_candidates.append(f"{base_core[:-len('.final')]}{MarkdownConfig.SUGGESTIONS_JSON_SUFFIX}")
+            for sug_name in sug_candidates:
+                sug_path = html_path.parent / sug_name
+                if sug_path.exists():
+                    try:
+                        suggestions = _load_suggestions(sug_path)
+                        logger.info(f"检测到建议JSON，已加载: {sug_path}")
+                    except Exception as e:
+                        logger.warning(f"加载建议JSON失败，将忽略: {sug_path}，错误: {e}")
+                    break
+
+            # 在相同目录输出final HTML（若输入已是final，避免生成 .final.final.html）
+            if base_core.endswith('.final'):
+                final_html_path = None  # 已是最终版，跳过另存final HTML
+            else:
+                final_html_name = f"{base_core}.final.html"
+                final_html_path = str(html_path.parent / final_html_name)
+
+            ok = self._convert_html_to_pdf(str(html_path), str(pdf_file), suggestions=suggestions, final_html_path=final_html_path)
+            if ok:
+                logger.success(f"PDF生成成功: {pdf_file}")
+                return True, str(pdf_file)
+            return False, ""
+        except Exception as e:
+            logger.error(f"HTML转PDF失败: {e}")
+            return False, ""
+    
+    def _write_external_css(self, out_path: Path) -> None:
+        """将样式写入输出目录的 _report.css；内容未变时不重复写入。
+
+        先比较文件大小，大小一致时才读回内容比对，样式变化时通常无需读取旧文件。
+        """
+        css_file = out_path / _EXTERNAL_CSS_NAME
+        data = self.css_style.encode('utf-8')
+        try:
+            if css_file.stat().st_size == len(data) and css_file.read_bytes() == data:
+                return
+        except FileNotFoundError:
+            pass
+        css_file.write_bytes(data)
+
+    def _load_default_css(self) -> str:
+        """加载默认CSS样式（基于test_document_style.html）"""
+        return _DEFAULT_CSS
     
-    if(ce||inTable){ autoSave(); }
-  });
-  // 页面加载后绑定增强处理并设置编辑标记
-  function initEditor(){
-    attachConclusionHandlers();
-    // 设置编辑标记以启用编辑态样式压缩
-    if(document.body){
-      document.body.setAttribute('data-editing', 'true');
-    }
-  }
-  if(document.readyState === 'loading'){
-    document.addEventListener('DOMContentLoaded', initEditor);
-  } else {
-    initEditor();
-  }
-  try{ var cached=localStorage.getItem('report_edits'); if(cached){ applyData(JSON.parse(cached)); } }catch(e){}
-  window.__editor = { saveJSON: saveJSON, loadJSON: loadJSON, exportFinalHTML: exportFinalHTML, previewFormatted: previewFormatted, addRow: addRow, removeLastRow: removeLastRow, addConclusionRow: addConclusionRow, removeConclusionRow: removeConclusionRow };
-})();
-</script>
-"""
-        return script.replace('__SUG_SUFFIX__', suffix)
+    def _render_base_html(self, md_path: Path) -> str:
+        """读取Markdown并生成基础HTML，同时设置 md_content
+
+        默认样式下按 (路径, mtime, size, 输出目录, 样式模式) 复用渲染结果：
+        同一文档先后生成可编辑HTML与PDF时只解析一次；文件变化后自动失效。
+        """
+        if self.css_style is not _DEFAULT_CSS_MIN and self.css_style is not _DEFAULT_CSS:
+            self.md_content = md_path.read_text(encoding='utf-8')
+            return self._convert_md_to_html()
+        st = md_path.stat()
+        self.md_content, html = _render_md_cached(
+            os.path.abspath(md_path), st.st_mtime_ns, st.st_size,
+            os.path.abspath(self.output_dir), self.external_css,
+            self.css_style is _DEFAULT_CSS_MIN,
+        )
+        return html
+
+    def _convert_md_to_html(self) -> str:
+        """将Markdown转换为HTML"""
+        if _import_markdown() is None:
+            raise ImportError("缺少markdown包，无法将Markdown转换为HTML")
+        # 分割文档为三个部分：封面、目录、正文
+        cover_html = self._process_cover_section()
+        toc_html = self._process_toc_section()
+        content_html = self._process_content_section()
+        
+        # 提取标题
+        title = self._extract_title()
+        
+        # 生成完整HTML：正文可能很大，一次拼接，避免 f-string 逐段扩容
+        if self.external_css:
+            head = _HTML_HEAD_LINK_TMPL.format(title=title, css_href=_EXTERNAL_CSS_NAME)
+        else:
+            head = _HTML_HEAD_TMPL.format(title=title, css=self.css_style)
+        return "".join((head, cover_html, "\n", toc_html, "\n", content_html, _HTML_TAIL))
+
+    def _make_html_editable(self, html: str) -> str:
+        """对HTML注入可编辑控件：建议表格、综合结论、工具条与打印样式"""
+        try:
+            # 先在正文上完成各项标记，最后再注入约20KB的编辑样式/脚本：
+            # 各趟扫描与替换不必反复复制这部分头部内容（注入块中不含任何标记所匹配的文本）
+
+            # 标记 1.2 建议表格（找到1.2标题后的第一张表）
+            html = self._mark_advice_table_editable(html)
+
+            # 标记 综合结论 占位（按章节锚点依次处理）
+            html = self._mark_conclusions_editable(html)
+            # 捕获页面上其余“综合结论：[…]”占位并统一为空的可编辑区域
+            html = self._mark_all_conclusion_placeholders(html)
+            # 规范结论区结构，避免 <p> 内嵌 <div>
+            html = self._normalize_conclusion_blocks(html)
+            # 标记“服务器类型二选一”单元格可编辑（下拉选择）
+            html = self._mark_server_type_editable(html)
+
+            # 注入工具条与样式（插入到</head>前与<body>开始处）
+            style_block = self._editor_style_block()
+            script_block = self._editor_script_block()
+
+            # 注入报告元数据（用于文件命名）
+            meta_base = f'<meta name="x-report-base" content="{self.output_name}">'
+
+            if '</head>' in html and '<body>' in html and '<body>' not in meta_base:
+                # 常规文档：单次扫描同时完成</head>与<body>两处注入
+                inject = {
+                    '</head>': f"{meta_base}\n{style_block}\n{script_block}\n</head>",
+                    '<body>': '<body>\n' + self._editor_toolbar_block(),
+                }
+                html = _RE_HEAD_BODY.sub(lambda m: inject[m.group(0)], html)
+            else:
+                if '</head>' in html:
+                    html = html.replace('</head>', f"{meta_base}\n{style_block}\n{script_block}\n</head>")
+                else:
+                    html = f"<head>{meta_base}{style_block}{script_block}</head>\n{html}"
+
+                if '<body>' in html:
+                    html = html.replace('<body>', '<body>\n' + self._editor_toolbar_block())
+                else:
+                    html = '<body>' + self._editor_toolbar_block() + html
+
+            # 3.1 系统硬件配置表：保持默认样式（RAC不再做特殊列宽处理）
+
+            return html
+        except Exception as e:
+            logger.error(f"注入可编辑控件失败: {e}")
+            return html
+
+    def _mark_advice_table_editable(self, html: str) -> str:
+        """将1.2节后的第一张表格设为可编辑，并添加行管理按钮"""
+        # 子串预检：缺少1.2标题或表格时无需正则扫描
+        if '1.2.' not in html or '<table' not in html:
+            return html
+        try:
+            # 寻找1.2节标题
+            m = _RE_H2_ADVICE.search(html)
+            if not m:
+                return html
+            start = m.end()
+
+            # 找到其后的第一个<table>
+            table_start = html.find('<table', start)
+            if table_start == -1:
+                return html
+            table_end = html.find('</table>', table_start)
+            if table_end == -1:
+                return html
+            table_end += len('</table>')
+
+            table_html = html[table_start:table_end]
+
+            # 给<table>打标记 data-suggest-id（及供脚本 getElementById 定位的 id），避免重复添加
+            if 'data-suggest-id="advice_table"' not in table_html:
+                table_html = table_html.replace('<table', '<table id="advice-table" data-suggest-id="advice_table"', 1)
+
+            # 为所有<td>增加contenteditable
+            def add_editable_td(match):
+                td_tag = match.group(0)
+                if 'contenteditable' in td_tag:
+                    return td_tag
+                return td_tag.replace('<td', '<td contenteditable="true"')
+
+            table_html = _RE_TD_EDITABLE.sub(add_editable_td, table_html)
+
+            # 在表格后添加行编辑按钮（编辑阶段显示，打印隐藏）
+            controls = (
+                '<div class="edit-controls" data-target="advice_table" aria-hidden="false">'
+                '<button type="button" onclick="window.__editor.addRow(\'advice_table\')">新增一行</button>'
+                '<button type="button" onclick="window.__editor.removeLastRow(\'advice_table\')">删除末行</button>'
+                '</div>'
+            )
+
+            # 一次拼接：按总长预分配，避免连加产生整篇文档大小的中间串
+            return "".join((html[:table_start], table_html, controls, html[table_end:]))
+        except Exception as e:
+            logger.error(f"标记1.2建议表格失败: {e}")
+            return html
+
+    def _mark_conclusions_editable(self, html: str) -> str:
+        """将指定章节内的"综合结论：【…】"替换为可编辑表格"""
+        if MarkdownConfig.CONCLUSION_TEXT_PREFIX not in html:
+            return html
+        # 单次扫描全部<h2>，记录每个锚点首次出现的章节（例如 5.2. …）
+        sections = []
+        pending = dict(_CONCL_SECTION_ANCHORS)
+        for m in _RE_H2_ELEMENT.finditer(html):
+            heading = m.group(1).lstrip()
+            for key, anchor in pending.items():
+                if heading.startswith(anchor):
+                    sec_start = m.end()
+                    # 章节结束位置（下一个<h2>或文档结束）
+                    next_h2 = html.find('<h2', sec_start)
+                    sections.append((sec_start, next_h2 if next_h2 != -1 else len(html), key))
+                    del pending[key]
+                    break
+            if not pending:
+                break
+        if not sections:
+            return html
+
+        # 各章节互不重叠，按位置顺序拼接一次
+        parts: List[str] = []
+        pos = 0
+        for sec_start, sec_end, key in sorted(sections):
+            parts.append(html[pos:sec_start])
+            pos = sec_start
+            try:
+                segment = html[sec_start:sec_end]
+
+                # 查找"综合结论：【…】"
+                if not _RE_CONCL_PLACEHOLDER.search(segment):
+                    continue
+
+                def _repl(match):
+                    # 使用表格形式替换
+                    table_id = f"conclusion_table_{key}"
+                    return _CONCL_TABLE_HTML(table_id=table_id)
+
+                parts.append(_RE_CONCL_PLACEHOLDER.sub(_repl, segment, count=1))
+                pos = sec_end
+            except Exception as e:
+                logger.error(f"标记章节{key}结论失败: {e}")
+                continue
+        parts.append(html[pos:])
+        return "".join(parts)
+
+    def _mark_all_conclusion_placeholders(self, html: str) -> str:
+        """将页面上所有剩余的"综合结论：【…】"替换为可编辑表格，自动编号ID。"""
+        if MarkdownConfig.CONCLUSION_TEXT_PREFIX not in html:
+            return html
+        try:
+            # 为避免替换已经处理过的段落，这里先跳过包含 contenteditable 的片段
+            # 简单做法：全局替换，随后移除重复：若在已含contenteditable的上下文内，不会出现原始占位文本
+            # 按占位切分后交替拼接表格，编号随位置递增（切分结果中分组捕获项按步长跳过）
+            pieces = _RE_CONCL_PLACEHOLDER.split(html)[::_RE_CONCL_PLACEHOLDER.groups + 1]
+            out = [pieces[0]]
+            for auto_idx, piece in enumerate(pieces[1:], 1):
+                out.append(_CONCL_TABLE_HTML(table_id=f"conclusion_table_auto_{auto_idx}"))
+                out.append(piece)
+            return "".join(out)
+        except Exception as e:
+            logger.warning(f"替换通用结论占位失败: {e}")
+            return html
+
+    def _normalize_conclusion_blocks(self, html: str) -> str:
+        """修复 <p> 内嵌 <div class="editable-conclusion"> 的结构为分离的块级元素
+
+        转换：
+          <p>综合结论：<div class="editable-conclusion" ...></div></p>
+        为：
+          <p><strong>综合结论：</strong></p><div class="editable-conclusion" ...></div>
+        """
+        try:
+            # 仅在存在可编辑结论块时执行两种结构修复
+            if 'editable-conclusion' in html:
+                # 基础情形：<p>综合结论：<div class="editable-conclusion">...</div></p>
+                html = _RE_CONCL_P_DIV.sub(r"<p><strong>综合结论：</strong></p>\1", html)
+                # 可选情形：<p><strong>综合结论：</strong><div ...></div></p>
+                html = _RE_CONCL_STRONG_DIV.sub(r"<p><strong>综合结论：</strong></p>\1", html)
+            # 清理多余的空段落
+            if '<p>' in html:
+                html = _RE_EMPTY_P.sub("", html)
+            return html
+        except Exception as e:
+            logger.debug(f"规范结论块结构失败: {e}")
+            return html
+
+    def _editor_style_block(self) -> str:
+        """返回编辑模式所需样式，打印时隐藏编辑UI"""
+        return """
+<style>
+/* 编辑标识与工具条样式 */
+[contenteditable="true"] { outline: 1px dashed #999; padding: 2px; font-size: 12pt; line-height: inherit; }
+
+/* 结论编辑区域特殊样式 */
+.editable-conclusion {
+    display: block;
+    width: 100%;
+    min-height: 1.2em;
+    margin-top: 0.3em;
+    padding: 6px 10px;
+    border: 1px dashed #4a90e2;
+    border-radius: 4px;
+    background: #f0f8ff;
+    font-size: 12pt;
+    line-height: 1.4;
+    white-space: pre-wrap;
+    word-wrap: break-word;
+    overflow-wrap: break-word;
+    box-sizing: border-box;
+}
+
+.editable-conclusion:empty:before {
+    content: attr(placeholder);
+    color: #9aa0a6;
+    font-style: italic;
+}
+
+.editable-conclusion:focus {
+    outline: none;
+    border-color: #4a90e2;
+    background: #ffffff;
+    box-shadow: 0 0 4px rgba(74, 144, 226, 0.3);
+}
+
+/* 最终态渲染（预览/导出） */
+.conclusion-output{
+    margin: .3em 0 .8em;
+    white-space: pre-wrap; /* 保留空格和换行 */
+    border: none; background: transparent; padding: 0;
+}
+.conclusion-output p{ margin: 0 0 .6em; text-indent: 2em; }
+.conclusion-output ul, .conclusion-output ol{ margin: .4em 0 .8em 2em; }
+
+#edit-toolbar { 
+    position: sticky; 
+    top: 0; 
+    background: #fff8dc; 
+    border-bottom: 1px solid #ddd; 
+    padding: 8px; 
+    z-index: 9999; 
+    font-size: 12px; 
+}
+#edit-toolbar button { margin-right: 8px; }
+
+/* 表格编辑样式保持不变 */
+table[data-suggest-id="advice_table"] [contenteditable="true"] {
+    outline: 1px dashed #999;
+    padding: 2px;
+}
+
+/* 结论表格样式 */
+.conclusion-table {
+    border-collapse: collapse;
+    width: 100%;
+    margin: 10px 0;
+}
+
+.conclusion-table th {
+    background-color: #f0f0f0;
+    border: 1px solid #ddd;
+    padding: 8px;
+    text-align: left;
+    font-weight: bold;
+}
+
+.conclusion-table td {
+    border: 1px solid #ddd;
+    padding: 8px;
+    vertical-align: top;
+}
+
+.conclusion-table td:first-child {
+    text-align: center;
+    font-weight: bold;
+    background-color: #f9f9f9;
+}
+
+.conclusion-table [contenteditable="true"] {
+    outline: 1px dashed #999;
+    padding: 4px;
+    min-height: 60px;
+    white-space: pre-wrap;
+}
+
+.edit-controls { margin: 6px 0 12px 0; }
+.edit-controls button { margin-right: 6px; }
+
+/* 行内选择字段（如服务器类型二选一） */
+.field-inline select { font-size: 12pt; padding: 2px 6px; }
+
+/* 预览覆盖层 */
+#preview-overlay {
+  position: fixed;
+  inset: 0;
+  background: rgba(0,0,0,0.45);
+  z-index: 10000;
+  display: none;
+}
+#preview-panel {
+  position: absolute;
+  left: 5%;
+  top: 5%;
+  width: 90%;
+  height: 90%;
+  background: #fff;
+  border: 1px solid #ccc;
+  box-shadow: 0 6px 18px rgba(0,0,0,0.2);
+  overflow: auto;
+  border-radius: 6px;
+}
+#preview-close {
+  position: sticky;
+  top: 0;
+  float: right;
+  margin: 8px;
+}
+#preview-content { padding: 16px 20px; max-width: 210mm; margin: 0 auto; font-size: 12pt; line-height: 1.5; }
+
+/* 打印隐藏编辑UI */
+@media print {
+  #edit-toolbar, .edit-controls { display: none !important; }
+  [contenteditable="true"] { outline: none !important; border: none !important; background: transparent !important; }
+  .editable-conclusion { border: none !important; background: transparent !important; padding: 0 !important; }
+  #preview-overlay { display: none !important; }
+}
+
+/* 编辑态压缩封面与目录留白（仅优化浏览器视图，不影响打印） */
+body.editing .cover-page {
+  min-height: auto !important;
+  justify-content: flex-start !important;
+  padding: 16px 20px !important;
+}
+body.editing .cover-page::before,
+body.editing .cover-page::after {
+  display: none !important;
+}
+body.editing .cover-page h1 {
+  margin: 12px 0 !important;
+}
+body.editing .cover-page h2 {
+  margin: 6px 0 16px !important;
+}
+body.editing .cover-info {
+  margin-top: 8px !important;
+  margin-bottom: 16px !important;
+}
+body.editing .toc-page {
+  padding: 16px !important;
+}
+
+/* 保持默认表格列宽，不对3.1章节做特殊样式 */
+</style>
+        """
+
+    def _editor_toolbar_block(self) -> str:
+        """顶部工具条（仅保留导出功能）"""
+        return """
+<div id="edit-toolbar" role="region" aria-label="编辑工具">
+  <strong>编辑模式：</strong>
+  <button type="button" onclick="window.__editor.previewFormatted()">预览格式化</button>
+  <button type="button" onclick="window.__editor.exportFinalHTML()">导出最终HTML</button>
+  <span style="margin-left: 16px; color: #666; font-size: 11px;">
+    提示：编辑完成后，请导出最终HTML，然后使用 htmltopdf 命令转换为PDF
+  </span>
+</div>
+        """
+
+    def _editor_script_block(self) -> str:
+        """注入编辑脚本：序列化/反序列化与导出纯净HTML（ES5兼容）"""
+        return _editor_script(MarkdownConfig.SUGGESTIONS_JSON_SUFFIX)
 
     def _mark_server_type_editable(self, html: str) -> str:
         """将特定TD文本“X86数据库服务器 / Oracle ExaData 一体机 (二选一)”替换为下拉选择控件
@@ -1373,34 +1680,41 @@ body[data-editing="true"] .toc-page {
         生成形如：
         <td><span class="field-inline" data-suggest-id="server_type"><select>...</select></span></td>
         """
+        if 'X86数据库服务器' not in html:
+            return html
         try:
-            pattern = re.compile(r'(<td[^>]*>)\s*X86数据库服务器\s*/\s*Oracle ExaData 一体机\s*\(二选一\)\s*(</td>)')
-            if not pattern.search(html):
-                return html
-            replacement = (r'\1'
-                            r'<span class="field-inline" data-suggest-id="server_type">'
-                            r'<select>'
-                            r'<option value="">请选择</option>'
-                            r'<option value="X86数据库服务器">X86数据库服务器</option>'
-                            r'<option value="Oracle ExaData 一体机">Oracle ExaData 一体机</option>'
-                            r'</select>'
-                            r'</span>'
-                            r'\2')
-            return pattern.sub(replacement, html)
+            # 无匹配时 sub 原样返回，无需先 search 再扫描一遍
+            return _RE_SERVER_TYPE_TD.sub(_SERVER_TYPE_REPL, html)
         except Exception as e:
             logger.error(f"标记服务器类型可编辑失败: {e}")
             return html
     
+    @property
+    def md_lines(self) -> List[str]:
+        """按行切分的 md_content（同一份内容只切分一次，调用方不得修改返回的列表）"""
+        md = self.md_content
+        cache = self._md_lines_cache
+        if cache is None or cache[0] is not md:
+            cache = self._md_lines_cache = (md, md.split('\n'))
+        return cache[1]
+
     def _extract_title(self) -> str:
-        """从MD提取标题"""
-        for line in self.md_content.split('\n')[:20]:
+        """从MD提取标题（只看前20行；同一份 md_content 只计算一次）"""
+        md = self.md_content
+        cache = self._title_cache
+        if cache is not None and cache[0] is md:
+            return cache[1]
+        title = "数据库健康检查报告"
+        for line in self.md_lines[:20]:
             if '# ' in line and ('数据库' in line or '系统' in line):
-                return re.sub(r'^#+\s*', '', line).strip()
-        return "数据库健康检查报告"
+                title = line.lstrip('#').strip()
+                break
+        self._title_cache = (md, title)
+        return title
     
     def _process_cover_section(self) -> str:
         """处理封面部分"""
-        lines = self.md_content.split('\n')
+        lines = self.md_lines
         cover_end_idx = 0
         
         # 找到封面结束位置 (到"---"分隔线或"# 目录"之前)
@@ -1420,10 +1734,24 @@ body[data-editing="true"] .toc-page {
         # 构建封面HTML - 传统文档风格
         html = ['<div class="cover-page">']
         
-        in_table = False
         table_lines = []
-        
-        for i, line in enumerate(cover_lines):
+
+        def flush_table():
+            # 表格结束，生成HTML
+            if len(table_lines) > 2:  # 至少有标题行和数据行
+                html.append('<div class="cover-info">')
+                html.append(self._parse_markdown_table(table_lines))
+                html.append('</div>')
+            table_lines.clear()
+
+        # 单次扫描：上一行是表格行且本行不含'|'时表格结束（每行只检查一次）
+        prev_table = False
+        for line in cover_lines:
+            has_pipe = '|' in line
+            if prev_table and not has_pipe:
+                flush_table()
+            prev_table = False
+
             # 跳过HTML标签
             if '<div style="text-align: center;">' in line or '</div>' in line:
                 continue
@@ -1437,28 +1765,18 @@ body[data-editing="true"] .toc-page {
                 html.append(f'<h2 style="font-size:22pt;">{content}</h2>')
             # 处理图片
             elif '![' in line:
-                match = re.search(r'!\[([^\]]*)\]\(([^)]+)\)', line)
+                # 先用子串判断，缺少"]("的行不进正则
+                match = '](' in line and re.search(r'!\[([^\]]*)\]\(([^)]+)\)', line)
                 if match:
                     alt_text = match.group(1)
                     img_path = self._fix_image_path(match.group(2))
                     html.append(f'<img src="{img_path}" alt="{alt_text}" style="max-width:300px; height:auto;">')
             # 处理表格
-            elif '|' in line and line.strip():
-                if not in_table:
-                    in_table = True
-                    table_lines = [line]
-                else:
-                    table_lines.append(line)
-                    
-                # 检查下一行是否还是表格
-                if i + 1 >= len(cover_lines) or (i + 1 < len(cover_lines) and '|' not in cover_lines[i + 1]):
-                    # 表格结束，生成HTML
-                    if len(table_lines) > 2:  # 至少有标题行和数据行
-                        html.append('<div class="cover-info">')
-                        html.append(self._parse_markdown_table(table_lines))
-                        html.append('</div>')
-                    in_table = False
-                    table_lines = []
+            elif has_pipe:
+                table_lines.append(line)
+                prev_table = True
+        if prev_table:
+            flush_table()
         
         html.append('</div>')  # 关闭 cover-page
         
@@ -1477,8 +1795,7 @@ body[data-editing="true"] .toc-page {
         
         if headers:
             html.append('<thead><tr>')
-            for header in headers:
-                html.append(f'<th>{header}</th>')
+            html.extend(['<th>' + header + '</th>' for header in headers])
             html.append('</tr></thead>')
         
         # 跳过分隔线（第二行）
@@ -1493,8 +1810,7 @@ body[data-editing="true"] .toc-page {
                 cells = [cell.strip() for cell in line.split('|') if cell.strip()]
                 if cells:
                     html.append('<tr>')
-                    for cell in cells:
-                        html.append(f'<td>{cell}</td>')
+                    html.extend(['<td>' + cell + '</td>' for cell in cells])
                     html.append('</tr>')
             
             html.append('</tbody>')
@@ -1528,7 +1844,7 @@ body[data-editing="true"] .toc-page {
     
     def _process_toc_section(self) -> str:
         """处理目录部分 - 传统文档风格带虚线"""
-        lines = self.md_content.split('\n')
+        lines = self.md_lines
         toc_lines = []
         in_toc = False
         
@@ -1558,25 +1874,36 @@ body[data-editing="true"] .toc-page {
             if not line.strip():
                 continue
             
-            # 转换markdown链接为纯文本
-            text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', line)
+            # 转换markdown链接为纯文本（无"]("的行不可能含链接）
+            text = _TOC_LINK_RE.sub(r'\1', line) if '](' in line else line
             text = text.strip()
             
             if not text:
                 continue
             
             # 判断层级
-            if text.startswith('-'):
-                # 子目录项
+            is_sub = text.startswith('-')
+            if is_sub:
+                # 子目录项（1.1. 与 1.1.1 均按二级显示）
                 text = text.lstrip('-').strip()
-                # 判断是一级还是二级子目录
-                if re.match(r'^\d+\.\d+\.', text):  # 如 1.1. 
-                    level_class = 'toc-level-2'
-                elif re.match(r'^\d+\.\d+\.\d+', text):  # 如 1.1.1
-                    level_class = 'toc-level-3'
-                else:
-                    level_class = 'toc-level-2'
-            elif re.match(r'^\d+\.', text):  # 主章节
+            # 一次扫描开头编号，分离编号与标题文本："1.2. 标题" 取全部数字段；
+            # "1.2.3 标题" 末段后没有"."，编号取 "1.2."，末段数字归入标题
+            runs, end = _scan_toc_number(text)
+            if runs and text[end:end + 1] == '.':
+                numbered = True
+                num = '.'.join(runs) + '.'
+                title = text[end + 1:].lstrip()
+            elif len(runs) > 1:
+                numbered = True
+                num = '.'.join(runs[:-1]) + '.'
+                title = text[end - len(runs[-1]):].lstrip()
+            else:
+                numbered = False
+                num = ''
+                title = text
+            if is_sub:
+                level_class = 'toc-level-2'
+            elif numbered:  # 主章节（以"数字."开头）
                 level_class = 'toc-level-1'
                 page_num += 5  # 主章节间隔页数
             else:
@@ -1584,19 +1911,8 @@ body[data-editing="true"] .toc-page {
             
             # 计算锚点id（根据编号前缀生成sec-X或sec-X-Y）
             anchor_id = None
-            m = re.match(r'^(\d+)(?:\.(\d+))?', text)
-            if m:
-                s1 = m.group(1)
-                s2 = m.group(2)
-                anchor_id = f'sec-{s1}-{s2}' if s2 else f'sec-{s1}'
-
-            # 分离编号与标题文本
-            num = ''
-            title = text
-            m2 = re.match(r'^(\d+(?:\.\d+)*)\.\s*(.*)$', text)
-            if m2:
-                num = m2.group(1) + '.'
-                title = m2.group(2) if m2.group(2) else ''
+            if runs:
+                anchor_id = f'sec-{runs[0]}-{runs[1]}' if len(runs) > 1 else f'sec-{runs[0]}'
 
             # 生成新版目录行（整行可点击）
             level_cls = level_class.replace('toc-level', 'level')
@@ -1626,7 +1942,7 @@ body[data-editing="true"] .toc-page {
     def _process_content_section(self) -> str:
         """处理正文部分"""
         # 找到正文开始位置
-        lines = self.md_content.split('\n')
+        lines = self.md_lines
         content_start = 0
         
         # 方法1：查找"文档控制"作为正文开始
@@ -1638,7 +1954,7 @@ body[data-editing="true"] .toc-page {
         # 方法2：如果没找到文档控制，查找第一个带编号的章节
         if content_start == 0:
             for i, line in enumerate(lines):
-                if re.match(r'^# \d+\.', line):  # 匹配 "# 1. 健康检查总结" 这样的标题
+                if line.startswith('# ') and re.match(r'^# \d+\.', line):  # 匹配 "# 1. 健康检查总结" 这样的标题
                     content_start = i
                     break
         
@@ -1661,49 +1977,30 @@ body[data-editing="true"] .toc-page {
         
         # 预处理内容：确保列表前后有空行
         processed_lines = []
+        # 每行是否包含触发列表的关键词，只扫描一次，当前行与上一行判断共用
+        trig_flags = [any(trigger in ln for trigger in _LIST_TRIGGERS) for ln in content_lines]
+        # 每行是否为 "- " 列表项（按去除首尾空白后判断），同样只计算一次
+        item_flags = [ln.strip().startswith('- ') for ln in content_lines]
         for i, line in enumerate(content_lines):
-            # 检测需要列表的关键词
-            list_triggers = [
-                '本次数据库性能检查的工具是',
-                '主要从以下方面来检查操作系统的性能',
-                '主要从以下方面', 
-                '以下的部分是对操作系统的检查'
-            ]
-            
             # 检查是否包含触发列表的关键词
-            if any(trigger in line for trigger in list_triggers):
-                processed_lines.append(line)
-                processed_lines.append('')  # 添加空行确保列表正确解析
-            elif i > 0 and any(trigger in content_lines[i-1] for trigger in list_triggers) and line.strip().startswith('-'):
+            if trig_flags[i]:
+                processed_lines.extend((line, ''))  # 添加空行确保列表正确解析
+            elif i > 0 and trig_flags[i-1] and line.lstrip().startswith('-'):
                 # 这是列表的第一项
                 processed_lines.append(line)
-            elif line.strip().startswith('- ') and i > 0 and content_lines[i-1].strip().startswith('- '):
+            elif item_flags[i] and i > 0 and item_flags[i-1]:
                 # 列表的连续项
                 processed_lines.append(line)
-            elif i > 0 and content_lines[i-1].strip().startswith('- ') and not line.strip().startswith('- '):
+            elif i > 0 and item_flags[i-1] and not item_flags[i]:
                 # 列表结束，添加空行
-                processed_lines.append('')
-                processed_lines.append(line)
+                processed_lines.extend(('', line))
             else:
                 processed_lines.append(line)
         
         content = '\n'.join(processed_lines)
         
-        # 使用markdown库处理正文
-        md = _markdown.Markdown(
-            extensions=[
-                'tables',
-                'fenced_code',
-                'codehilite',
-                'attr_list'
-            ],
-            extension_configs={
-                'codehilite': {
-                    'linenums': False,
-                    'css_class': 'highlight'
-                }
-            }
-        )
+        # 使用markdown库处理正文（复用本线程的解析器实例）
+        md = _get_markdown()
         
         # 转换正文
         html = md.convert(content)
@@ -1722,20 +2019,17 @@ body[data-editing="true"] .toc-page {
     def _inject_heading_ids(self, html: str) -> str:
         """为正文中以数字编号开头的标题生成稳定的id（sec-X 或 sec-X-Y）。"""
         try:
-            import re as _re
-            pattern = _re.compile(r'<h([1-6])([^>]*)>(.*?)</h\1>', _re.DOTALL | _re.IGNORECASE)
-
             def repl(m):
                 level = m.group(1)
                 attrs = m.group(2)
                 inner = m.group(3)
                 # 如果已有id则保持
-                if _re.search(r'\bid\s*=\s*(["\"])', attrs):
+                if _RE_ID_ATTR.search(attrs):
                     return m.group(0)
                 # 去除内部HTML标签获取纯文本
-                text = _re.sub(r'<[^>]+>', '', inner).strip()
+                text = _RE_TAG.sub('', inner).strip()
                 # 提取编号（支持 "10." 或 "7.1."，点后可无空格）
-                mm = _re.match(r'\s*(\d+)(?:\.(\d+))?', text)
+                mm = _RE_NUM_PREFIX.match(text)
                 if not mm:
                     return m.group(0)
                 s1 = mm.group(1)
@@ -1744,7 +2038,7 @@ body[data-editing="true"] .toc-page {
                 new_attrs = f'{attrs} id="{anchor_id}"'
                 return f'<h{level}{new_attrs}>{inner}</h{level}>'
 
-            return pattern.sub(repl, html)
+            return _RE_HEADING.sub(repl, html)
         except Exception as e:
             logger.warning(f"为标题注入ID失败: {e}")
             return html
@@ -1773,7 +2067,7 @@ body[data-editing="true"] .toc-page {
         """修复所有图片路径"""
         def fix_path(match):
             img_tag = match.group(0)
-            src_match = re.search(r'src="([^"]+)"', img_tag)
+            src_match = _RE_IMG_SRC.search(img_tag)
             
             if src_match:
                 img_path = src_match.group(1)
@@ -1783,15 +2077,14 @@ body[data-editing="true"] .toc-page {
             return img_tag
         
         # 查找并替换所有img标签
-        html = re.sub(r'<img[^>]+>', fix_path, html)
+        html = _RE_IMG_TAG.sub(fix_path, html)
         
         return html
 
     def _mark_system_hardware_table_styled(self, html: str) -> str:
         """将 3.1. 系统硬件配置后的第一张表格标记为 sys-hw-table 以应用列宽样式。"""
         try:
-            h2_pattern = re.compile(r"<h2[^>]*>\s*3\.1\.[\s\S]*?</h2>")
-            m = h2_pattern.search(html)
+            m = _RE_H2_SYS_HW.search(html)
             if not m:
                 return html
             start = m.end()
@@ -1803,7 +2096,7 @@ body[data-editing="true"] .toc-page {
                 return html
             table_tag = html[t_start:t_end+1]
             if 'class=' in table_tag:
-                new_tag = re.sub(r'class="([^"]*)"', lambda mt: f'class="'+mt.group(1)+' sys-hw-table"', table_tag, count=1)
+                new_tag = _RE_CLASS_ATTR.sub(lambda mt: f'class="'+mt.group(1)+' sys-hw-table"', table_tag, count=1)
             else:
                 new_tag = table_tag.replace('<table', '<table class="sys-hw-table"', 1)
             return html[:t_start] + new_tag + html[t_end+1:]
@@ -1815,11 +2108,11 @@ body[data-editing="true"] .toc-page {
         """清理列表项中的多余<p>标签，特别是AWR报告部分"""
         # 移除<li>内部的<p>标签，保留内容
         # 匹配模式：<li>\n<p>内容</p>\n</li>
-        html = re.sub(r'<li>\s*<p>(.*?)</p>\s*</li>', r'<li>\1</li>', html, flags=re.DOTALL)
+        html = _RE_LI_P.sub(r'<li>\1</li>', html)
         
         # 处理嵌套的情况：<li>后紧跟<p>
-        html = re.sub(r'<li>\s*\n*\s*<p>', r'<li>', html)
-        html = re.sub(r'</p>\s*\n*\s*</li>', r'</li>', html)
+        html = _RE_LI_P_OPEN.sub(r'<li>', html)
+        html = _RE_P_LI_CLOSE.sub(r'</li>', html)
         
         return html
     
@@ -1875,9 +2168,9 @@ body[data-editing="true"] .toc-page {
                           if(Object.prototype.toString.call(rows)==='[object Array]'){
                             var table=document.querySelector('table[data-suggest-id="advice_table"]');
                             if(table){
-                              var tbody=table.querySelector('tbody')||table;
-                              var trs = tbody.querySelectorAll('tr');
-                              for(var i=trs.length-1;i>=0;i--){ if(trs[i].querySelectorAll('th').length===0){ tbody.removeChild(trs[i]); } }
+                              var tbody=table.tBodies[0]||table;
+                              var trs = tbody.rows;
+                              for(var i=trs.length-1;i>=0;i--){ if(trs[i].getElementsByTagName('th').length===0){ trs[i].parentNode.removeChild(trs[i]); } }
                               for(var r=0;r<rows.length;r++){
                                 var tr=document.createElement('tr'); var cols=rows[r]||[];
                                 for(var c=0;c<cols.length;c++){
@@ -1896,25 +2189,27 @@ body[data-editing="true"] .toc-page {
                 page.evaluate(
                     r"""
                     () => {
+                      var BULLET_RE = new RegExp('^\\s*[-*•·]\\s+');
+                      var NUM_RE = new RegExp('^\\s*\\d+[\\.)、]\\s+');
+                      var ESC_MAP = {'&':'&amp;', '<':'&lt;', '>':'&gt;'};
                       function _escapeHtml(s){
-                        return String(s).replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;');
+                        return String(s).replace(/[&<>]/g, function(c){ return ESC_MAP[c]; });
                       }
+                      var PUNCT_MAP = {'．':'。', ';':'；', ':':'：'};
                       function _formatUserTextToHtml(text){
                         if(!text) return '';
-                        text = text.replace(/\r\n?/g,'\n').replace(/\t/g,' ');
-                        text = text.replace(/[，，]/g,'，').replace(/[。．]/g,'。').replace(/[；;]/g,'；').replace(/[：:]/g,'：');
+                        text = text.replace(/\r\n?|\t/g, function(m){ return m === '\t' ? ' ' : '\n'; });
+                        text = text.replace(/[．;:]/g, function(c){ return PUNCT_MAP[c]; });
                         if(text.indexOf('\n')===-1 && text.length>120){ text = text.replace(new RegExp('([。；])\\s*','g'),'$1\n'); }
                         var lines = text.split('\n');
                         var html = [];
                         var listMode = null; var items=[];
-                        var bulletRe = new RegExp('^\\s*[-*•·]\\s+');
-                        var numRe = new RegExp('^\\s*\\d+[\\.)、]\\s+');
                         function flushList(){ if(!items.length) return; var tag=(listMode==='ol')?'ol':'ul'; html.push('<'+tag+'>'); for(var i=0;i<items.length;i++){ html.push('<li>'+_escapeHtml(items[i])+'</li>'); } html.push('</'+tag+'>'); items=[]; listMode=null; }
                         for(var i=0;i<lines.length;i++){
                           var line=lines[i].replace(/\s+$/,'');
                           if(!line){ if(listMode){ flushList(); } continue; }
-                          if(bulletRe.test(line)){ if(listMode && listMode!=='ul'){ flushList(); } listMode='ul'; items.push(line.replace(bulletRe,'')); continue; }
-                          if(numRe.test(line)){ if(listMode && listMode!=='ol'){ flushList(); } listMode='ol'; items.push(line.replace(numRe,'')); continue; }
+                          if(BULLET_RE.test(line)){ if(listMode && listMode!=='ul'){ flushList(); } listMode='ul'; items.push(line.replace(BULLET_RE,'')); continue; }
+                          if(NUM_RE.test(line)){ if(listMode && listMode!=='ol'){ flushList(); } listMode='ol'; items.push(line.replace(NUM_RE,'')); continue; }
                           if(listMode){ flushList(); }
                           // 保留连续空格，使用 &nbsp; 替换普通空格
                           var escapedLine = _escapeHtml(line).replace(/ {2,}/g, function(spaces) {
@@ -2001,3 +2296,14 @@ body[data-editing="true"] .toc-page {
         except Exception as e:
             logger.error(f"PDF生成失败: {e}")
             return False
+
+
+@functools.lru_cache(maxsize=8)
+def _render_md_cached(md_path: str, mtime_ns: int, size: int, output_dir: str,
+                      external_css: bool, minify_css: bool) -> Tuple[str, str]:
+    """渲染 Markdown 为基础HTML，返回 (md_content, html)；参数均为缓存键。"""
+    conv = MarkdownToPdfConverter(external_css=external_css, minify_css=minify_css)
+    conv.md_file_path = Path(md_path)
+    conv.output_dir = Path(output_dir)
+    conv.md_content = conv.md_file_path.read_text(encoding='utf-8')
+    return conv.md_content, conv._convert_md_to_html()